@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from apps.groups.services import GroupService
+
+
+class Command(BaseCommand):
+    help = "Recompute each group's member/message counters and last message, repairing any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--group", action="append", dest="group_ids", help="Only this group id (repeatable).")
+        parser.add_argument("--dry-run", action="store_true", help="Report drifted groups without fixing them.")
+
+    def handle(self, *args, **options):
+        drifted = GroupService.reconcile_counters(options["group_ids"], dry_run=options["dry_run"])
+
+        for group in drifted:
+            self.stdout.write(
+                f"{group.id} {group.name}: members={group.member_count} "
+                f"messages={group.message_count} last={group.last_message_at or '-'}"
+            )
+
+        verb = "Found" if options["dry_run"] else "Repaired"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(drifted)} drifted group(s)"))
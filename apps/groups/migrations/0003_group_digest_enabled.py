@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='digest_enabled',
+            field=models.BooleanField(default=False, help_text='Coalesce bursts of messages into one SMS per member'),
+        ),
+    ]
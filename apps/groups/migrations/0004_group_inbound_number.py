@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0003_group_digest_enabled'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='inbound_number',
+            field=models.CharField(blank=True, help_text='Dedicated Twilio number; texts to it are posted to this group', max_length=20, null=True, unique=True),
+        ),
+    ]
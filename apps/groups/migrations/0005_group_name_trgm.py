@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:34
+
+from django.db import migrations
+
+
+def create_trigram_index(apps, schema_editor):
+    # Other backends search through the in-process n-gram index instead.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS groups_name_trgm ON groups USING gin (UPPER(name) gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS groups_name_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0004_group_inbound_number'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:38
+
+import core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0005_group_name_trgm'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='membership',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
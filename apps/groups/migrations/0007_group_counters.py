@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:48
+
+from django.db import migrations, models
+
+
+def backfill_counters(apps, schema_editor):
+    Group = apps.get_model("groups", "Group")
+    Membership = apps.get_model("groups", "Membership")
+    Message = apps.get_model("chat_messages", "Message")
+    MessageArchive = apps.get_model("chat_messages", "MessageArchive")
+
+    members = dict(
+        Membership.objects.filter(is_active=True)
+        .values("group").annotate(total=models.Count("id")).values_list("group", "total")
+    )
+    messages = dict(Message.objects.values("group").annotate(total=models.Count("id")).values_list("group", "total"))
+    for group_id, total in MessageArchive.objects.values("group").annotate(total=models.Sum("message_count")).values_list("group", "total"):
+        messages[group_id] = messages.get(group_id, 0) + total
+
+    groups = list(Group.objects.all())
+    for group in groups:
+        group.member_count = members.get(group.id, 0)
+        group.message_count = messages.get(group.id, 0)
+        last = Message.objects.filter(group=group).order_by("-created_at", "-id").values_list("created_at", "content").first()
+        if last:
+            group.last_message_at, group.last_message_preview = last[0], last[1][:160]
+    Group.objects.bulk_update(
+        groups,
+        ["member_count", "message_count", "last_message_at", "last_message_preview"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0006_alter_membership_id'),
+        ('chat_messages', '0004_messagearchive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='message_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='last_message_preview',
+            field=models.CharField(blank=True, max_length=160),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
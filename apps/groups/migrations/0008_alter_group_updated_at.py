@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0007_group_counters'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='group',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -3,9 +3,14 @@ import uuid
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Case, F, Q, Value, When
+
+from core.ids import uuid7
 
 
 class Group(models.Model):
+    PREVIEW_LENGTH = 160
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=100, unique=True, db_index=True)
     created_by = models.ForeignKey(
@@ -15,8 +20,27 @@ class Group(models.Model):
         blank=True,
         related_name="created_groups",
     )
+    digest_enabled = models.BooleanField(
+        default=False,
+        help_text="Coalesce bursts of messages into one SMS per member",
+    )
+    inbound_number = models.CharField(
+        max_length=20,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text="Dedicated Twilio number; texts to it are posted to this group",
+    )
+    # Denormalized for list views; kept current with F() updates by MembershipService
+    # and MessageService, and repaired by the reconcile_group_counters command. The
+    # update runs inside the send transaction, so posts to one group serialize on
+    # its row lock until commit.
+    member_count = models.PositiveIntegerField(default=0)
+    message_count = models.PositiveIntegerField(default=0)
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    last_message_preview = models.CharField(max_length=PREVIEW_LENGTH, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         db_table = "groups"
@@ -32,15 +56,29 @@ class Group(models.Model):
             memberships__is_active=True
         )
 
-    def get_member_count(self) -> int:
-        return self.memberships.filter(is_active=True).count()
+    @classmethod
+    def record_messages(cls, group_id, count: int, last_at, last_content: str) -> None:
+        # last_message_* only move forward, so concurrent posts can't roll them back.
+        newer = Q(last_message_at__isnull=True) | Q(last_message_at__lt=last_at)
+        cls.objects.filter(id=group_id).update(
+            message_count=F("message_count") + count,
+            last_message_at=Case(When(newer, then=Value(last_at)), default=F("last_message_at")),
+            last_message_preview=Case(
+                When(newer, then=Value(last_content[:cls.PREVIEW_LENGTH])),
+                default=F("last_message_preview"),
+            ),
+        )
+
+    @classmethod
+    def adjust_member_count(cls, group_id, delta: int) -> None:
+        cls.objects.filter(id=group_id).update(member_count=F("member_count") + delta)
 
     def is_member(self, user) -> bool:
         return self.memberships.filter(user=user, is_active=True).exists()
 
 
 class Membership(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
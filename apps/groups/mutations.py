@@ -145,8 +145,114 @@ class TransferOwnership(graphene.Mutation):
             return TransferOwnershipPayload(success=False, errors=[make_error("group_id", str(e), e.code)])
 
 
+class RenameGroupInput(graphene.InputObjectType):
+    group_id = graphene.UUID(required=True)
+    name = graphene.String(required=True)
+
+
+class RenameGroupPayload(graphene.ObjectType):
+    success = graphene.Boolean(required=True)
+    group = graphene.Field(GroupType)
+    errors = graphene.List(FieldError)
+
+
+class RenameGroup(graphene.Mutation):
+    class Arguments:
+        input = RenameGroupInput(required=True)
+
+    Output = RenameGroupPayload
+
+    @staticmethod
+    def mutate(root, info, input):
+        user = require_auth(info)
+        if not user:
+            return RenameGroupPayload(success=False, errors=[make_error(None, "Authentication required", "AUTH_ERROR")])
+
+        try:
+            group = GroupService.get_group_by_id(str(input.group_id))
+            updated_group = GroupService.rename_group(user, group, input.name)
+            return RenameGroupPayload(success=True, group=updated_group, errors=[])
+        except NotFound as e:
+            return RenameGroupPayload(success=False, errors=[make_error("group_id", str(e), e.code)])
+        except (ConflictError, ValidationError) as e:
+            return RenameGroupPayload(success=False, errors=[make_error("name", str(e), e.code)])
+        except AuthError as e:
+            return RenameGroupPayload(success=False, errors=[make_error(None, str(e), e.code)])
+
+
+class SetDigestModeInput(graphene.InputObjectType):
+    group_id = graphene.UUID(required=True)
+    enabled = graphene.Boolean(required=True)
+
+
+class SetDigestModePayload(graphene.ObjectType):
+    success = graphene.Boolean(required=True)
+    group = graphene.Field(GroupType)
+    errors = graphene.List(FieldError)
+
+
+class SetDigestMode(graphene.Mutation):
+    class Arguments:
+        input = SetDigestModeInput(required=True)
+
+    Output = SetDigestModePayload
+
+    @staticmethod
+    def mutate(root, info, input):
+        user = require_auth(info)
+        if not user:
+            return SetDigestModePayload(success=False, errors=[make_error(None, "Authentication required", "AUTH_ERROR")])
+
+        try:
+            group = GroupService.get_group_by_id(str(input.group_id))
+            updated_group = GroupService.set_digest_mode(user, group, input.enabled)
+            return SetDigestModePayload(success=True, group=updated_group, errors=[])
+        except NotFound as e:
+            return SetDigestModePayload(success=False, errors=[make_error("group_id", str(e), e.code)])
+        except AuthError as e:
+            return SetDigestModePayload(success=False, errors=[make_error(None, str(e), e.code)])
+
+
+class SetInboundNumberInput(graphene.InputObjectType):
+    group_id = graphene.UUID(required=True)
+    number = graphene.String()
+
+
+class SetInboundNumberPayload(graphene.ObjectType):
+    success = graphene.Boolean(required=True)
+    group = graphene.Field(GroupType)
+    errors = graphene.List(FieldError)
+
+
+class SetInboundNumber(graphene.Mutation):
+    class Arguments:
+        input = SetInboundNumberInput(required=True)
+
+    Output = SetInboundNumberPayload
+
+    @staticmethod
+    def mutate(root, info, input):
+        user = require_auth(info)
+        if not user:
+            return SetInboundNumberPayload(success=False, errors=[make_error(None, "Authentication required", "AUTH_ERROR")])
+
+        try:
+            group = GroupService.get_group_by_id(str(input.group_id))
+            updated_group = GroupService.set_inbound_number(user, group, input.number)
+            return SetInboundNumberPayload(success=True, group=updated_group, errors=[])
+        except NotFound as e:
+            return SetInboundNumberPayload(success=False, errors=[make_error("group_id", str(e), e.code)])
+        except (ConflictError, ValidationError) as e:
+            return SetInboundNumberPayload(success=False, errors=[make_error("number", str(e), e.code)])
+        except AuthError as e:
+            return SetInboundNumberPayload(success=False, errors=[make_error(None, str(e), e.code)])
+
+
 class GroupMutation(graphene.ObjectType):
     create_group = CreateGroup.Field()
     join_group = JoinGroup.Field()
     leave_group = LeaveGroup.Field()
     transfer_ownership = TransferOwnership.Field()
+    rename_group = RenameGroup.Field()
+    set_digest_mode = SetDigestMode.Field()
+    set_inbound_number = SetInboundNumber.Field()
@@ -1,23 +1,39 @@
 import graphene
-from django.db.models import Count, Q
 from graphene_django import DjangoObjectType
+from graphql import GraphQLError
+
+from apps.messages.schema import MessageConnection
+from apps.messages.services import MessageService, encode_cursor
+from core.exceptions import ValidationError
 
 from .models import Group, Membership
+from .services import GroupService
 
 
 class GroupType(DjangoObjectType):
     class Meta:
         model = Group
-        fields = ["id", "name", "created_by", "created_at"]
+        fields = [
+            "id",
+            "name",
+            "created_by",
+            "digest_enabled",
+            "inbound_number",
+            "member_count",
+            "message_count",
+            "last_message_at",
+            "last_message_preview",
+            "created_at",
+        ]
 
-    member_count = graphene.Int()
     members = graphene.List("apps.users.schema.UserType")
     messages = graphene.List("apps.messages.schema.MessageType", first=graphene.Int(default_value=50))
-
-    def resolve_member_count(self, info) -> int:
-        if hasattr(self, "_member_count"):
-            return self._member_count
-        return self.get_member_count()
+    message_history = graphene.Field(
+        MessageConnection,
+        first=graphene.Int(default_value=50),
+        after=graphene.String(),
+        description="Messages newest first; pass pageInfo.endCursor as `after` for older ones.",
+    )
 
     def resolve_members(self, info) -> list:
         return list(self.get_active_members())
@@ -25,6 +41,21 @@ class GroupType(DjangoObjectType):
     def resolve_messages(self, info, first: int) -> list:
         return list(self.messages.select_related("sender").order_by("-created_at")[:first])
 
+    def resolve_message_history(self, info, first: int, after: str = None) -> MessageConnection:
+        try:
+            page, end_cursor = MessageService.get_message_page(self, first=max(1, min(first, 100)), before=after)
+        except ValidationError as e:
+            raise GraphQLError(str(e))
+        return MessageConnection(
+            edges=[MessageConnection.Edge(node=message, cursor=encode_cursor(message)) for message in page],
+            page_info=graphene.relay.PageInfo(
+                has_next_page=end_cursor is not None,
+                has_previous_page=bool(after),
+                start_cursor=encode_cursor(page[0]) if page else None,
+                end_cursor=encode_cursor(page[-1]) if page else None,
+            ),
+        )
+
 
 class MembershipType(DjangoObjectType):
     class Meta:
@@ -44,18 +75,7 @@ class GroupQuery(graphene.ObjectType):
             return None
 
     def resolve_groups(self, info, limit: int):
-        return (
-            Group.objects
-            .annotate(_member_count=Count("memberships", filter=Q(memberships__is_active=True)))
-            .order_by("-created_at")[:limit]
-        )
+        return Group.objects.order_by("-created_at")[:limit]
 
     def resolve_search_groups(self, info, query: str, limit: int):
-        if not query or not query.strip():
-            return []
-        return (
-            Group.objects
-            .filter(name__icontains=query.strip())
-            .annotate(_member_count=Count("memberships", filter=Q(memberships__is_active=True)))
-            [:limit]
-        )
+        return GroupService.search_groups(query, limit)
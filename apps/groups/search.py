@@ -0,0 +1,146 @@
+import threading
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Upper
+from django.db.models.lookups import Contains
+
+from .models import Group
+
+__all__ = ["NgramIndex", "get_ngram_index", "search_group_ids"]
+
+
+def search_group_ids(query: str, limit: int = 20, exclude_ids=()) -> list[str]:
+    # Group ids ranked prefix matches first, then by trigram similarity, then name.
+    query = query.strip() if query else ""
+    if not query:
+        return []
+    exclude_ids = {str(group_id) for group_id in exclude_ids}
+    if connection.vendor == "postgresql":
+        return _search_postgres(query, limit, exclude_ids)
+    return get_ngram_index().search(query, limit, exclude_ids)
+
+
+def _search_postgres(query: str, limit: int, exclude_ids: set[str]) -> list[str]:
+    # LIKE and pg_trgm's % operator are both served by the groups_name_trgm GIN index
+    # on UPPER(name), and the planner ORs them as one bitmap scan; similarity() is
+    # only computed for ranking the matches. % compares against
+    # pg_trgm.similarity_threshold, set here for this transaction only.
+    from django.contrib.postgres.lookups import TrigramSimilar
+    from django.contrib.postgres.search import TrigramSimilarity
+
+    term = query.upper()
+    threshold = getattr(settings, "GROUP_SEARCH_MIN_SIMILARITY", 0.3)
+    with transaction.atomic():
+        with connection.cursor() as db:
+            db.execute("SELECT set_config('pg_trgm.similarity_threshold', %s, true)", [str(threshold)])
+        rows = list(
+            Group.objects
+            .filter(Q(Contains(Upper("name"), term)) | Q(TrigramSimilar(Upper("name"), term)))
+            .exclude(id__in=exclude_ids)
+            .annotate(
+                similarity=TrigramSimilarity(Upper("name"), term),
+                is_prefix=Case(When(name__istartswith=query, then=Value(1)), default=Value(0), output_field=IntegerField()),
+            )
+            .order_by("-is_prefix", "-similarity", "name")
+            .values_list("id", flat=True)[:limit]
+        )
+    return [str(group_id) for group_id in rows]
+
+
+class NgramIndex:
+    # In-process trigram index over group names for databases without pg_trgm.
+    # Each search first pulls the groups updated since the last one (create and
+    # rename bump updated_at, which is indexed), so every process stays current
+    # without relying on a shared cache.
+    def __init__(self):
+        self._names: dict[str, tuple[str, int]] = {}
+        self._postings: dict[str, set[str]] = {}
+        self._synced_at = None
+        self._lock = threading.Lock()
+
+    def search(self, query: str, limit: int, exclude_ids=()) -> list[str]:
+        self.sync()
+        term = query.lower()
+        grams = _trigrams(term)
+        threshold = getattr(settings, "GROUP_SEARCH_MIN_SIMILARITY", 0.3)
+
+        with self._lock:
+            shared = Counter()
+            for gram in grams:
+                shared.update(self._postings.get(gram, ()))
+
+            if all(len(word) < 3 for word in term.split()):
+                # Words under three letters only share a trigram with a name they start a
+                # word of, so substring matches elsewhere ("ou" in "group") need a scan.
+                for group_id, (name, _) in self._names.items():
+                    if term in name:
+                        shared.setdefault(group_id, 0)
+
+            ranked = []
+            for group_id, count in shared.items():
+                entry = self._names.get(group_id)
+                if entry is None or group_id in exclude_ids:
+                    continue
+                name, size = entry
+                similarity = count / (len(grams) + size - count)
+                if term in name or similarity >= threshold:
+                    ranked.append((not name.startswith(term), -similarity, name, group_id))
+
+        ranked.sort()
+        return [group_id for _, _, _, group_id in ranked[:limit]]
+
+    def sync(self) -> None:
+        with self._lock:
+            rows = Group.objects.all()
+            if self._synced_at is not None:
+                # Overlap the watermark so a save that committed late isn't skipped.
+                rows = rows.filter(updated_at__gte=self._synced_at - timedelta(seconds=60))
+            latest = self._synced_at
+            for group_id, name, updated_at in rows.values_list("id", "name", "updated_at").iterator():
+                self._put(str(group_id), name)
+                latest = max(latest, updated_at) if latest else updated_at
+            self._synced_at = latest
+
+            # Deletes leave no updated_at behind; a count below ours means some happened.
+            if Group.objects.count() < len(self._names):
+                live = {str(group_id) for group_id in Group.objects.values_list("id", flat=True)}
+                for group_id in set(self._names) - live:
+                    self._evict(group_id)
+
+    def _evict(self, group_id: str) -> None:
+        name, _ = self._names.pop(group_id)
+        for gram in _trigrams(name):
+            self._postings[gram].discard(group_id)
+
+    def _put(self, group_id: str, name: str) -> None:
+        name = name.lower()
+        previous = self._names.get(group_id)
+        if previous and previous[0] == name:
+            return
+        if previous:
+            for gram in _trigrams(previous[0]):
+                self._postings[gram].discard(group_id)
+        grams = _trigrams(name)
+        self._names[group_id] = (name, len(grams))
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(group_id)
+
+
+def _trigrams(text: str) -> set[str]:
+    # pg_trgm's scheme: each word padded with two leading spaces and one trailing.
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+_ngram_index = NgramIndex()
+
+
+def get_ngram_index() -> NgramIndex:
+    return _ngram_index
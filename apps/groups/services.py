@@ -1,11 +1,17 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError, transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from apps.messages.models import Message, MessageArchive
+from apps.sms.routing import InboundNumberTable, RoutingCache
+from apps.users.services import UserService
 from core.exceptions import AuthError, ConflictError, NotFound, ValidationError
 
 from .models import Group, Membership
+from .search import search_group_ids
 
 User = get_user_model()
 
@@ -22,9 +28,30 @@ class GroupService:
         try:
             group = Group.objects.create(name=name, created_by=creator)
             MembershipService.join_group(creator, group)
-            return group
+            group.refresh_from_db(fields=["member_count"])
         except IntegrityError:
             raise ConflictError(f"Group name '{name}' already exists")
+        return group
+
+    @staticmethod
+    def rename_group(user: User, group: Group, name: str) -> Group:
+        if group.created_by != user:
+            raise AuthError("Only the owner can rename the group")
+
+        name = name.strip()
+        if not name:
+            raise ValidationError("Group name is required")
+
+        group.name = name
+        try:
+            with transaction.atomic():
+                group.save(update_fields=["name", "updated_at"])
+        except IntegrityError:
+            raise ConflictError(f"Group name '{name}' already exists")
+        # Members' routing snapshots hold the old name.
+        member_ids = list(group.memberships.filter(is_active=True).values_list("user_id", flat=True))
+        transaction.on_commit(lambda: [RoutingCache.invalidate(user_id) for user_id in member_ids])
+        return group
 
     @staticmethod
     def get_group_by_id(group_id: str) -> Group:
@@ -34,10 +61,62 @@ class GroupService:
             raise NotFound("Group not found")
 
     @staticmethod
-    def search_groups(query: str, limit: int = 20):
-        if not query or not query.strip():
-            return Group.objects.none()
-        return Group.objects.filter(name__icontains=query.strip())[:limit]
+    def search_groups(query: str, limit: int = 20, exclude_ids=()) -> list[Group]:
+        group_ids = search_group_ids(query, limit, exclude_ids)
+        if not group_ids:
+            return []
+        groups = {str(group.id): group for group in Group.objects.filter(id__in=group_ids)}
+        # Keep the search ranking; ids of groups deleted since indexing drop out.
+        return [groups[group_id] for group_id in group_ids if group_id in groups]
+
+    @staticmethod
+    def set_digest_mode(user: User, group: Group, enabled: bool) -> Group:
+        if group.created_by != user:
+            raise AuthError("Only the owner can change digest mode")
+
+        group.digest_enabled = enabled
+        group.save(update_fields=["digest_enabled", "updated_at"])
+        return group
+
+    @staticmethod
+    def set_inbound_number(user: User, group: Group, number: str | None) -> Group:
+        if group.created_by != user:
+            raise AuthError("Only the owner can change the group number")
+
+        if number:
+            number = UserService.validate_phone_number(number)
+            if number not in getattr(settings, "SMS_GROUP_NUMBERS", []):
+                raise ValidationError("That number is not available for groups")
+
+        group.inbound_number = number or None
+        try:
+            with transaction.atomic():
+                group.save(update_fields=["inbound_number", "updated_at"])
+        except IntegrityError:
+            raise ConflictError("That number is already assigned to another group")
+        transaction.on_commit(InboundNumberTable.refresh)
+        return group
+
+    @staticmethod
+    def reconcile_counters(group_ids=None, dry_run: bool = False) -> list[Group]:
+        # Recomputes the denormalized counters from the source tables and repairs the
+        # groups that drifted. message_count includes archived messages; when all of a
+        # group's messages are archived its last_message_* fields are left alone.
+        groups = Group.objects.all() if group_ids is None else Group.objects.filter(id__in=group_ids)
+        drifted = [group for group in _with_actual_counters(groups).iterator(chunk_size=500) if _apply_drift(group)]
+        if dry_run:
+            return drifted
+
+        repaired = []
+        for group in drifted:
+            # Joins, leaves and posts bump the counters on this row after writing their
+            # own rows, so once it's locked a fresh count agrees with whatever they add.
+            with transaction.atomic():
+                group = _with_actual_counters(Group.objects.select_for_update().filter(id=group.id)).first()
+                if group is not None and _apply_drift(group):
+                    group.save(update_fields=_COUNTER_FIELDS)
+                    repaired.append(group)
+        return repaired
 
     @staticmethod
     def list_groups(limit: int = 20, offset: int = 0):
@@ -48,6 +127,7 @@ class MembershipService:
     @staticmethod
     def join_group(user: User, group: Group) -> Membership:
         with transaction.atomic():
+            transaction.on_commit(lambda: RoutingCache.invalidate(user.id))
             existing = Membership.objects.select_for_update().filter(user=user, group=group).first()
 
             if existing:
@@ -56,6 +136,7 @@ class MembershipService:
                 existing.is_active = True
                 existing.left_at = None
                 existing.save(update_fields=["is_active", "left_at"])
+                Group.adjust_member_count(group.id, 1)
                 return existing
 
             max_groups = getattr(settings, "MAX_GROUPS_PER_USER", 10)
@@ -63,7 +144,9 @@ class MembershipService:
             if current_count >= max_groups:
                 raise ValidationError(f"You can only join {max_groups} groups")
 
-            return Membership.objects.create(user=user, group=group)
+            membership = Membership.objects.create(user=user, group=group)
+            Group.adjust_member_count(group.id, 1)
+            return membership
 
     @staticmethod
     def leave_group(user: User, group: Group) -> None:
@@ -81,9 +164,11 @@ class MembershipService:
             group.created_by = next_owner.user if next_owner else None
             group.save(update_fields=["created_by", "updated_at"])
 
-        membership.is_active = False
-        membership.left_at = timezone.now()
-        membership.save(update_fields=["is_active", "left_at"])
+        # Conditional, so two concurrent leaves can't both decrement the counter.
+        left = Membership.objects.filter(id=membership.id, is_active=True).update(is_active=False, left_at=timezone.now())
+        if left:
+            Group.adjust_member_count(group.id, -1)
+        transaction.on_commit(lambda: RoutingCache.invalidate(user.id))
 
     @staticmethod
     def transfer_ownership(owner: User, group: Group, new_owner: User) -> Group:
@@ -95,3 +180,42 @@ class MembershipService:
         group.created_by = new_owner
         group.save(update_fields=["created_by", "updated_at"])
         return group
+
+
+_COUNTER_FIELDS = ["member_count", "message_count", "last_message_at", "last_message_preview"]
+
+
+def _with_actual_counters(groups):
+    members = (
+        Membership.objects.filter(group=OuterRef("pk"), is_active=True)
+        .values("group").annotate(total=Count("id")).values("total")
+    )
+    hot = Message.objects.filter(group=OuterRef("pk")).values("group").annotate(total=Count("id")).values("total")
+    archived = (
+        MessageArchive.objects.filter(group=OuterRef("pk"))
+        .values("group").annotate(total=Sum("message_count")).values("total")
+    )
+    latest = Message.objects.filter(group=OuterRef("pk")).order_by("-created_at", "-id")
+    return groups.annotate(
+        actual_members=Coalesce(Subquery(members, output_field=IntegerField()), 0),
+        actual_messages=(
+            Coalesce(Subquery(hot, output_field=IntegerField()), 0)
+            + Coalesce(Subquery(archived, output_field=IntegerField()), 0)
+        ),
+        actual_last_at=Subquery(latest.values("created_at")[:1]),
+        actual_last_content=Subquery(latest.values("content")[:1]),
+    )
+
+
+def _apply_drift(group: Group) -> bool:
+    # Sets the counters from the actual_* annotations; returns whether any changed.
+    expected = {"member_count": group.actual_members, "message_count": group.actual_messages}
+    if group.actual_last_at is not None:
+        expected["last_message_at"] = group.actual_last_at
+        expected["last_message_preview"] = group.actual_last_content[:Group.PREVIEW_LENGTH]
+    changed = False
+    for field, value in expected.items():
+        if getattr(group, field) != value:
+            setattr(group, field, value)
+            changed = True
+    return changed
@@ -1,4 +1,6 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import post_migrate
 
 
 class MessagesConfig(AppConfig):
@@ -6,3 +8,15 @@ class MessagesConfig(AppConfig):
     name = "apps.messages"
     verbose_name = "Messages"
     label = "chat_messages"  # Avoid conflict with django.contrib.messages
+
+    def ready(self):
+        post_migrate.connect(_check_search_index, sender=self)
+
+
+def _check_search_index(sender, using, verbosity=1, **kwargs):
+    # A migration that rebuilds the messages table on SQLite drops the search triggers.
+    from .fts import ensure_sqlite_index
+
+    connection = connections[using]
+    if connection.vendor == "sqlite" and ensure_sqlite_index(connection) and verbosity >= 1:
+        print("  Rebuilt the messages search index (its triggers were missing)")
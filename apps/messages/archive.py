@@ -0,0 +1,105 @@
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.functions import TruncMonth
+
+from .models import Message, MessageArchive
+
+User = get_user_model()
+
+_DELETE_CHUNK_SIZE = 500
+
+__all__ = ["MessageArchiveService"]
+
+
+class MessageArchiveService:
+    @staticmethod
+    def archivable_months(before: date) -> list[tuple]:
+        # (group id, month) pairs with hot messages older than `before`, a month start.
+        return list(
+            Message.objects
+            .filter(created_at__lt=_month_start(before))
+            .annotate(month=TruncMonth("created_at", tzinfo=dt_timezone.utc))
+            .values_list("group_id", "month")
+            .distinct()
+            .order_by("month", "group_id")
+        )
+
+    @staticmethod
+    def archive_month(group_id, month: date) -> int:
+        start = _month_start(month)
+        end = _month_start(date(start.year + start.month // 12, start.month % 12 + 1, 1))
+        with transaction.atomic():
+            rows = list(
+                Message.objects
+                .filter(group_id=group_id, created_at__gte=start, created_at__lt=end)
+                .order_by("created_at", "id")
+                .values("id", "sender_id", "content", "created_at")
+            )
+            if not rows:
+                return 0
+
+            archive, _ = MessageArchive.objects.select_for_update().get_or_create(
+                group_id=group_id,
+                month=start.date(),
+                defaults={"payload": b""},
+            )
+            merged = {row["id"]: row for row in (archive.get_rows() if archive.message_count else [])}
+            for row in rows:
+                merged[str(row["id"])] = {
+                    "id": str(row["id"]),
+                    "sender_id": str(row["sender_id"]),
+                    "content": row["content"],
+                    "created_at": row["created_at"].astimezone(dt_timezone.utc).isoformat(timespec="microseconds"),
+                }
+            archive.set_rows(list(merged.values()))
+            archive.save()
+            # Deleted by created_at range, a chunk at a time, so no statement carries
+            # the whole month's ids. Outbox, delivery and dead-letter rows are kept as
+            # send history; their message FK is nulled (SET_NULL) in one UPDATE each.
+            for chunk_start in range(0, len(rows), _DELETE_CHUNK_SIZE):
+                chunk = rows[chunk_start:chunk_start + _DELETE_CHUNK_SIZE]
+                Message.objects.filter(
+                    group_id=group_id,
+                    created_at__gte=chunk[0]["created_at"],
+                    created_at__lte=chunk[-1]["created_at"],
+                ).delete()
+        return len(rows)
+
+    @staticmethod
+    def read_before(group, before: tuple | None, limit: int) -> list[Message]:
+        # Newest-first archived messages older than the (created_at, id) cursor,
+        # rebuilt as unsaved Message instances.
+        archives = MessageArchive.objects.filter(group=group).order_by("-month")
+        if before:
+            archives = archives.filter(month__lte=before[0].astimezone(dt_timezone.utc).date().replace(day=1))
+            before = (before[0], uuid.UUID(str(before[1])))
+
+        found = []
+        for archive in archives.iterator(chunk_size=4):
+            for row in reversed(archive.get_rows()):
+                key = (datetime.fromisoformat(row["created_at"]), uuid.UUID(row["id"]))
+                if before and key >= before:
+                    continue
+                found.append((key, row))
+                if len(found) >= limit:
+                    break
+            if len(found) >= limit:
+                break
+
+        senders = {
+            str(user_id): user
+            for user_id, user in User.objects.in_bulk({row["sender_id"] for _, row in found}).items()
+        }
+        return [
+            Message(id=message_id, group=group, sender=senders[row["sender_id"]], content=row["content"], created_at=created_at)
+            for (created_at, message_id), row in found
+            # Archived rows outlive their senders; drop them as the CASCADE would have.
+            if row["sender_id"] in senders
+        ]
+
+
+def _month_start(day: date) -> datetime:
+    return datetime(day.year, day.month, 1, tzinfo=dt_timezone.utc)
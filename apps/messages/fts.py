@@ -0,0 +1,63 @@
+# SQLite full-text index over messages.content, used by MessageSearchService.
+#
+# messages has a UUID primary key, so its implicit rowid isn't stable (VACUUM may
+# renumber it). messages_fts_keys gives every message a stable integer key that
+# is used as the rowid of the FTS5 table, and triggers on messages keep both in
+# sync. Rebuilding the messages table (as some migrations do on SQLite) drops
+# those triggers; the post_migrate check below puts them back and reindexes.
+
+SQLITE_TABLES = [
+    "CREATE TABLE IF NOT EXISTS messages_fts_keys ("
+    "id INTEGER PRIMARY KEY, message_id CHAR(32) NOT NULL UNIQUE)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5("
+    "content, tokenize='unicode61 remove_diacritics 2')",
+]
+
+SQLITE_TRIGGERS = {
+    "messages_fts_ai": """CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages BEGIN
+        INSERT INTO messages_fts_keys(message_id) VALUES (new.id);
+        INSERT INTO messages_fts(rowid, content) VALUES (last_insert_rowid(), new.content);
+    END""",
+    "messages_fts_ad": """CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN
+        DELETE FROM messages_fts WHERE rowid = (SELECT id FROM messages_fts_keys WHERE message_id = old.id);
+        DELETE FROM messages_fts_keys WHERE message_id = old.id;
+    END""",
+    "messages_fts_au": """CREATE TRIGGER IF NOT EXISTS messages_fts_au AFTER UPDATE OF content ON messages BEGIN
+        UPDATE messages_fts SET content = new.content
+        WHERE rowid = (SELECT id FROM messages_fts_keys WHERE message_id = new.id);
+    END""",
+}
+
+SQLITE_REBUILD = [
+    "DELETE FROM messages_fts",
+    "DELETE FROM messages_fts_keys",
+    "INSERT INTO messages_fts_keys(message_id) SELECT id FROM messages",
+    "INSERT INTO messages_fts(rowid, content) "
+    "SELECT k.id, m.content FROM messages_fts_keys k JOIN messages m ON m.id = k.message_id",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS messages_fts_au",
+    "DROP TRIGGER IF EXISTS messages_fts_ad",
+    "DROP TRIGGER IF EXISTS messages_fts_ai",
+    "DROP TABLE IF EXISTS messages_fts",
+    "DROP TABLE IF EXISTS messages_fts_keys",
+]
+
+
+def create_sqlite_index(db) -> None:
+    for sql in SQLITE_TABLES + list(SQLITE_TRIGGERS.values()) + SQLITE_REBUILD:
+        db.execute(sql)
+
+
+def ensure_sqlite_index(connection) -> bool:
+    # Recreates missing triggers and reindexes; returns whether anything was missing.
+    # Does nothing until the search migration has created the index.
+    with connection.cursor() as db:
+        names = ["messages_fts_keys", *SQLITE_TRIGGERS]
+        db.execute(f"SELECT name FROM sqlite_master WHERE name IN ({', '.join(['%s'] * len(names))})", names)
+        present = {name for name, in db.fetchall()}
+        if "messages_fts_keys" not in present or set(SQLITE_TRIGGERS) <= present:
+            return False
+        create_sqlite_index(db)
+    return True
@@ -0,0 +1,40 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.messages.archive import MessageArchiveService
+
+
+class Command(BaseCommand):
+    help = "Move messages from months older than the hot window into compressed per-group monthly archives."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hot-months",
+            type=int,
+            default=getattr(settings, "MESSAGE_HOT_MONTHS", 6),
+            help="Whole months to keep in the messages table, including the current one.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="List the months that would be archived.")
+
+    def handle(self, *args, **options):
+        today = date.today()
+        months_back = today.year * 12 + today.month - 1 - (max(options["hot_months"], 1) - 1)
+        cutoff = date(months_back // 12, months_back % 12 + 1, 1)
+
+        months = MessageArchiveService.archivable_months(cutoff)
+        total = 0
+        for group_id, month in months:
+            if options["dry_run"]:
+                self.stdout.write(f"Would archive {group_id} {month:%Y-%m}")
+                continue
+            moved = MessageArchiveService.archive_month(group_id, month)
+            total += moved
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Archived {moved} messages for {group_id} {month:%Y-%m}")
+
+        if not options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(
+                f"Archived {total} messages in {len(months)} group-months older than {cutoff:%Y-%m}"
+            ))
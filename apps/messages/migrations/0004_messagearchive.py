@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:41
+
+import core.ids
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat_messages', '0003_alter_message_id'),
+        ('groups', '0006_alter_membership_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MessageArchive',
+            fields=[
+                ('id', models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('month', models.DateField(help_text='First day of the archived month')),
+                ('message_count', models.PositiveIntegerField(default=0)),
+                ('payload', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='message_archives', to='groups.group')),
+            ],
+            options={
+                'db_table': 'message_archives',
+                'ordering': ['-month'],
+                'constraints': [models.UniqueConstraint(fields=('group', 'month'), name='unique_group_month_archive')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:45
+
+from django.db import migrations
+
+from apps.messages.fts import SQLITE_DROP, SQLITE_REBUILD, SQLITE_TABLES, SQLITE_TRIGGERS
+
+POSTGRES_FORWARD = [
+    "ALTER TABLE messages ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', content)) STORED",
+    "CREATE INDEX IF NOT EXISTS messages_search_gin ON messages USING gin (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS messages_search_gin",
+    "ALTER TABLE messages DROP COLUMN IF EXISTS search_vector",
+]
+# See apps/messages/fts.py for why the FTS5 table is keyed through messages_fts_keys.
+SQLITE_FORWARD = SQLITE_TABLES + list(SQLITE_TRIGGERS.values()) + SQLITE_REBUILD
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat_messages', '0004_messagearchive'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_FORWARD, "sqlite": SQLITE_FORWARD}),
+            _run({"postgresql": POSTGRES_BACKWARD, "sqlite": SQLITE_DROP}),
+        ),
+    ]
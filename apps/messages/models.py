@@ -1,17 +1,23 @@
-import uuid
+import json
+import zlib
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
+
+from core.ids import uuid7
 
 
 class Message(models.Model):
     MAX_CONTENT_LENGTH = 1600
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Time-ordered, so inserts append to the primary-key index instead of splitting pages.
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     group = models.ForeignKey("groups.Group", on_delete=models.CASCADE, related_name="messages")
     sender = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="sent_messages")
     content = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Not auto_now_add, so batched inserts can stamp strictly increasing times.
+    created_at = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
 
     class Meta:
         db_table = "messages"
@@ -21,3 +27,33 @@ class Message(models.Model):
     def __str__(self):
         preview = self.content[:50] + "..." if len(self.content) > 50 else self.content
         return f"{self.sender.name} in {self.group.name}: {preview}"
+
+
+class MessageArchive(models.Model):
+    # Cold tier: one group's messages for one calendar month, as zlib-compressed
+    # JSON, moved out of `messages` by the archive_messages command.
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    group = models.ForeignKey("groups.Group", on_delete=models.CASCADE, related_name="message_archives")
+    month = models.DateField(help_text="First day of the archived month")
+    message_count = models.PositiveIntegerField(default=0)
+    payload = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "message_archives"
+        ordering = ["-month"]
+        constraints = [
+            models.UniqueConstraint(fields=["group", "month"], name="unique_group_month_archive"),
+        ]
+
+    def __str__(self):
+        return f"{self.group_id} {self.month:%Y-%m} ({self.message_count} messages)"
+
+    def get_rows(self) -> list[dict]:
+        return json.loads(zlib.decompress(bytes(self.payload)))
+
+    def set_rows(self, rows: list[dict]) -> None:
+        rows = sorted(rows, key=lambda row: (row["created_at"], row["id"]))
+        self.payload = zlib.compress(json.dumps(rows, separators=(",", ":")).encode(), 9)
+        self.message_count = len(rows)
@@ -1,9 +1,67 @@
+import graphene
 from graphene_django import DjangoObjectType
+from graphql import GraphQLError
+
+from apps.groups.models import Group
+from apps.users.schema import get_user_from_context
+from core.exceptions import AuthError, ValidationError
 
 from .models import Message
+from .search import MessageSearchService
 
 
 class MessageType(DjangoObjectType):
     class Meta:
         model = Message
         fields = ["id", "group", "sender", "content", "created_at"]
+
+
+class MessageConnection(graphene.relay.Connection):
+    class Meta:
+        node = MessageType
+
+
+class MessageSearchHitType(graphene.ObjectType):
+    message = graphene.Field(MessageType, required=True)
+    rank = graphene.Float(required=True)
+    highlight = graphene.String(required=True, description="HTML-escaped content with matches in <mark> tags.")
+
+
+class MessageSearchConnection(graphene.relay.Connection):
+    class Meta:
+        node = MessageSearchHitType
+
+
+class MessageQuery(graphene.ObjectType):
+    search_messages = graphene.Field(
+        MessageSearchConnection,
+        query=graphene.String(required=True),
+        group_id=graphene.UUID(),
+        first=graphene.Int(default_value=20),
+        after=graphene.String(),
+    )
+
+    def resolve_search_messages(self, info, query: str, first: int, group_id=None, after: str = None):
+        user = get_user_from_context(info)
+        if not user:
+            raise GraphQLError("Authentication required")
+
+        group = Group.objects.filter(id=group_id).first() if group_id else None
+        if group_id and group is None:
+            raise GraphQLError("Group not found")
+        try:
+            hits, end_cursor = MessageSearchService.search(
+                user, query, group=group, first=max(1, min(first, 50)), after=after,
+            )
+        except (AuthError, ValidationError) as e:
+            raise GraphQLError(str(e))
+
+        return MessageSearchConnection(
+            edges=[MessageSearchConnection.Edge(node=hit, cursor=hit.cursor) for hit in hits],
+            page_info=graphene.relay.PageInfo(
+                has_next_page=end_cursor is not None,
+                has_previous_page=bool(after),
+                start_cursor=hits[0].cursor if hits else None,
+                end_cursor=hits[-1].cursor if hits else None,
+            ),
+        )
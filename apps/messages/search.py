@@ -0,0 +1,145 @@
+import base64
+import binascii
+import re
+import uuid
+from datetime import datetime
+
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from apps.groups.models import Membership
+from core.exceptions import AuthError, ValidationError
+
+from .models import Message
+
+__all__ = ["MessageSearchService", "SearchHit"]
+
+# Private-use characters mark matches, so highlights can be escaped before the
+# markers become <mark> tags.
+_START, _STOP = "\ue000", "\ue001"
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchHit:
+    def __init__(self, message: Message, rank: float, highlight: str):
+        self.message = message
+        self.rank = rank
+        self.highlight = mark_safe(escape(highlight).replace(_START, "<mark>").replace(_STOP, "</mark>"))
+        self.cursor = _encode_cursor(rank, message.created_at, message.id)
+
+
+class MessageSearchService:
+    @staticmethod
+    def search(user, query: str, group=None, first: int = 20, after: str = None) -> tuple[list[SearchHit], str | None]:
+        # Best match first, then newest. Scoped to `group`, or to every group the user
+        # is in. Returns a page of hits and the cursor for the next (None on the last).
+        query = query.strip() if query else ""
+        if not query:
+            return [], None
+
+        group_ids = list(Membership.objects.filter(user=user, is_active=True).values_list("group_id", flat=True))
+        if group is not None:
+            if group.id not in group_ids:
+                raise AuthError("You are not a member of this group")
+            group_ids = [group.id]
+        if not group_ids:
+            return [], None
+
+        cursor = _decode_cursor(after) if after else None
+        if connection.vendor == "postgresql":
+            rows = _search_postgres(query, group_ids, cursor, first + 1)
+        elif connection.vendor == "sqlite":
+            rows = _search_sqlite(query, group_ids, cursor, first + 1)
+        else:
+            rows = _search_fallback(query, group_ids, cursor, first + 1)
+
+        messages = Message.objects.select_related("sender", "group").in_bulk([message_id for message_id, _, _ in rows])
+        hits = [
+            SearchHit(messages[message_id], rank, highlight)
+            for message_id, rank, highlight in rows[:first]
+            if message_id in messages
+        ]
+        end_cursor = hits[-1].cursor if len(rows) > first and hits else None
+        return hits, end_cursor
+
+
+def _search_postgres(query: str, group_ids: list, cursor: tuple | None, limit: int) -> list[tuple]:
+    # messages.search_vector is a generated tsvector column with a GIN index.
+    terms = _WORD.findall(query)
+    if not terms:
+        return []
+    # Every term must match and the last one is a prefix, as on SQLite; \w+ terms
+    # can't carry tsquery operators.
+    tsquery = " & ".join(terms) + ":*"
+
+    after = ""
+    options = f"StartSel={_START}, StopSel={_STOP}, MaxFragments=2, MinWords=5, MaxWords=20"
+    params = [options, tsquery, [str(g) for g in group_ids]]
+    if cursor:
+        # Ordered by rank desc, created_at desc, id desc, so one row comparison pages all three.
+        after = "AND (ts_rank(m.search_vector, q), m.created_at, m.id) < (%s::real, %s, %s)"
+        params += [cursor[0], cursor[1], cursor[2]]
+    params.append(limit)
+    sql = f"""
+        SELECT m.id, ts_rank(m.search_vector, q) AS rank, ts_headline('simple', m.content, q, %s) AS highlight
+        FROM messages m, to_tsquery('simple', %s) q
+        WHERE m.group_id = ANY(%s::uuid[]) AND m.search_vector @@ q {after}
+        ORDER BY rank DESC, m.created_at DESC, m.id DESC
+        LIMIT %s
+    """
+    with connection.cursor() as db:
+        db.execute(sql, params)
+        return [(message_id, float(rank), highlight) for message_id, rank, highlight in db.fetchall()]
+
+
+def _search_sqlite(query: str, group_ids: list, cursor: tuple | None, limit: int) -> list[tuple]:
+    # messages_fts is an FTS5 table keyed through messages_fts_keys; see fts.py.
+    terms = _WORD.findall(query)
+    if not terms:
+        return []
+    # Quote every term so user input can't inject FTS5 syntax; the last one is a prefix.
+    match = " ".join(f'"{term}"' for term in terms) + "*"
+
+    placeholders = ", ".join(["%s"] * len(group_ids))
+    params = [_START, _STOP, match] + [uuid.UUID(str(g)).hex for g in group_ids]
+    after = ""
+    if cursor:
+        # bm25 is lower-is-better, so the score is negated to sort descending like ts_rank.
+        after = "AND (-bm25(messages_fts), m.created_at, m.id) < (%s, %s, %s)"
+        params += [cursor[0], connection.ops.adapt_datetimefield_value(cursor[1]), uuid.UUID(str(cursor[2])).hex]
+    params.append(limit)
+    sql = f"""
+        SELECT m.id, -bm25(messages_fts) AS rank, snippet(messages_fts, 0, %s, %s, '…', 24) AS highlight
+        FROM messages_fts
+        JOIN messages_fts_keys k ON k.id = messages_fts.rowid
+        JOIN messages m ON m.id = k.message_id
+        WHERE messages_fts MATCH %s AND m.group_id IN ({placeholders}) {after}
+        ORDER BY rank DESC, m.created_at DESC, m.id DESC
+        LIMIT %s
+    """
+    with connection.cursor() as db:
+        db.execute(sql, params)
+        return [(uuid.UUID(message_id), float(rank), highlight) for message_id, rank, highlight in db.fetchall()]
+
+
+def _search_fallback(query: str, group_ids: list, cursor: tuple | None, limit: int) -> list[tuple]:
+    # Unindexed substring match for backends without a full-text index here.
+    messages = Message.objects.filter(group_id__in=group_ids, content__icontains=query)
+    if cursor:
+        messages = messages.filter(created_at__lte=cursor[1]).exclude(created_at=cursor[1], id__gte=cursor[2])
+    rows = messages.order_by("-created_at", "-id").values_list("id", "content")[:limit]
+    pattern = re.compile(re.escape(query), re.IGNORECASE)
+    return [(message_id, 0.0, pattern.sub(lambda m: f"{_START}{m.group(0)}{_STOP}", content)) for message_id, content in rows]
+
+
+def _encode_cursor(rank: float, created_at: datetime, message_id) -> str:
+    return base64.urlsafe_b64encode(f"{rank!r}|{created_at.isoformat()}|{message_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[float, datetime, uuid.UUID]:
+    try:
+        rank, created_at, message_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return float(rank), datetime.fromisoformat(created_at), uuid.UUID(message_id)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValidationError("Invalid cursor")
@@ -1,10 +1,33 @@
-from apps.groups.models import Group
+import base64
+import binascii
+import logging
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.groups.models import Group, Membership
+from apps.sms.delivery import DeliveryService
+from apps.sms.encoding import EncodedBody, encode_body
+from apps.sms.models import OutboundSMS, SMSDelivery
+from apps.sms.outbox import OutboxService
 from apps.sms.services import SMSService
-from core.exceptions import AuthError, ValidationError
+from core.exceptions import AuthError, DomainError, ValidationError
 
+from .archive import MessageArchiveService
 from .models import Message
 
-__all__ = ["MessageService"]
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["MessageService", "decode_cursor", "encode_cursor"]
 
 
 class MessageService:
@@ -13,26 +36,149 @@ class MessageService:
         if not group.is_member(sender):
             raise AuthError("You are not a member of this group")
 
+        content = MessageService._clean_content(content)
+        use_outbox = getattr(settings, "SMS_DELIVERY_MODE", "outbox") == "outbox"
+        parts = encode_body(f"[{group.name}] {sender.name}: {content}")
+
+        with transaction.atomic():
+            message = Message.objects.create(group=group, sender=sender, content=content)
+            Group.record_messages(group.id, 1, message.created_at, content)
+            members = list(
+                group.get_active_members()
+                .exclude(id=sender.id)
+                .values_list("id", "phone_number")
+            )
+            recipients = [phone for _, phone in members]
+            MessageService._mark_active(group, [sender.id] + [user_id for user_id, _ in members])
+            sender.last_active_group = group
+            if recipients and use_outbox:
+                for part in parts:
+                    OutboxService.enqueue(
+                        recipients,
+                        part.text,
+                        message=message,
+                        digest=group.digest_enabled,
+                        from_number=group.inbound_number or "",
+                    )
+
+        if recipients:
+            logger.info(
+                "Message %s: %d segment(s) x %d recipient(s) = %d billed segments",
+                message.id, sum(p.segments for p in parts), len(recipients),
+                sum(p.segments for p in parts) * len(recipients),
+            )
+        if recipients and not use_outbox:
+            # After commit, including any transaction the caller holds open (inbound
+            # SMS processing does), so the fan-out neither runs under the group row
+            # lock nor repeats if that transaction rolls back and Twilio retries.
+            transaction.on_commit(
+                lambda: MessageService._send_now(message, recipients, parts, from_number=group.inbound_number)
+            )
+
+        return message
+
+    @staticmethod
+    def send_messages(posts: list[tuple]) -> list[Message | DomainError]:
+        # Batched send_message for inbound bursts: one insert for every post, one
+        # membership query for every group involved, and one outbox insert. Returns
+        # the Message, or the error that rejected it, for each (sender, group, content).
+        groups = {group.id: group for _, group, _ in posts}
+        members = defaultdict(dict)
+        rows = (
+            Membership.objects
+            .filter(group_id__in=list(groups), is_active=True)
+            .values_list("group_id", "user_id", "user__phone_number")
+        )
+        for group_id, user_id, phone in rows:
+            members[group_id][user_id] = phone
+
+        results, messages = [], []
+        stamp = timezone.now()
+        for sender, group, content in posts:
+            try:
+                if sender.id not in members[group.id]:
+                    raise AuthError("You are not a member of this group")
+                content = MessageService._clean_content(content)
+            except DomainError as e:
+                results.append(e)
+                continue
+            # Strictly increasing, so each group's history keeps the order the texts arrived in.
+            stamp = max(timezone.now(), stamp + timedelta(microseconds=1))
+            message = Message(group=group, sender=sender, content=content, created_at=stamp)
+            results.append(message)
+            messages.append(message)
+        if not messages:
+            return results
+
+        use_outbox = getattr(settings, "SMS_DELIVERY_MODE", "outbox") == "outbox"
+        sends, jobs, billed = [], [], 0
+        for message in messages:
+            group = message.group
+            recipients = [phone for user_id, phone in members[group.id].items() if user_id != message.sender_id]
+            parts = encode_body(f"[{group.name}] {message.sender.name}: {message.content}")
+            billed += sum(p.segments for p in parts) * len(recipients)
+            if recipients and use_outbox:
+                for part in parts:
+                    jobs.extend(OutboxService.build(
+                        recipients,
+                        part.text,
+                        message=message,
+                        digest=group.digest_enabled,
+                        from_number=group.inbound_number or "",
+                    ))
+            elif recipients:
+                sends.append((message, recipients, parts, group.inbound_number))
+
+        with transaction.atomic():
+            Message.objects.bulk_create(messages)
+            OutboundSMS.objects.bulk_create(jobs)
+            # Each group's last message decides who it becomes the active group for.
+            last_by_group = {message.group_id: message for message in messages}
+            counts = Counter(message.group_id for message in messages)
+            for group_id, last in sorted(last_by_group.items(), key=lambda item: item[1].created_at):
+                MessageService._mark_active(groups[group_id], list(members[group_id]))
+                Group.record_messages(group_id, counts[group_id], last.created_at, last.content)
+
+        logger.info("Posted %d message(s) to %d group(s): %d billed segments", len(messages), len(last_by_group), billed)
+        for message, recipients, parts, from_number in sends:
+            # After commit, as in send_message.
+            transaction.on_commit(partial(MessageService._send_now, message, recipients, parts, from_number=from_number))
+        return results
+
+    @staticmethod
+    def _clean_content(content: str) -> str:
         content = content.strip() if content else ""
         if not content:
             raise ValidationError("Message cannot be empty")
         if len(content) > Message.MAX_CONTENT_LENGTH:
             raise ValidationError(f"Message exceeds {Message.MAX_CONTENT_LENGTH} characters")
+        return content
 
-        message = Message.objects.create(group=group, sender=sender, content=content)
+    @staticmethod
+    def _mark_active(group: Group, user_ids: list) -> None:
+        User.objects.filter(id__in=user_ids).update(last_active_group=group, last_active_at=timezone.now())
 
-        recipients = list(
-            group.get_active_members()
-            .exclude(id=sender.id)
-            .values_list("phone_number", flat=True)
-        )
-        if recipients:
+    @staticmethod
+    def _send_now(message: Message, recipients: list[str], parts: list[EncodedBody], from_number: str = None) -> None:
+        # Groups with their own number broadcast from it, so replies route straight back.
+        sms_service = SMSService(from_number=from_number)
+        for part in parts:
             try:
-                SMSService().send_bulk(recipients, f"[{group.name}] {sender.name}: {content}")
+                results, errors = sms_service.send_bulk_detailed(recipients, part.text)
+                DeliveryService.record_sends([
+                    SMSDelivery(
+                        sid=sid,
+                        message=message,
+                        to_number=phone,
+                        from_number=sms_service.sender_for(phone),
+                        segments=part.segments,
+                    )
+                    for phone, sid in results.items()
+                ])
+                if errors:
+                    OutboxService.record_failures(errors, part.text, message=message)
             except Exception:
-                pass
-
-        return message
+                logger.exception("Failed to broadcast message %s", message.id)
 
     @staticmethod
     def get_group_messages(group: Group, limit: int = 50):
@@ -42,3 +188,37 @@ class MessageService:
             .select_related("sender")
             .order_by("-created_at")[:limit]
         )
+
+    @staticmethod
+    def get_message_page(group: Group, first: int = 50, before: str = None) -> tuple[list[Message], str | None]:
+        # Newest-first page of messages older than the `before` cursor, plus the cursor
+        # for the page after it (None on the last page). Keyset paging on
+        # (created_at, id) walks the (group, -created_at) index, so every page costs
+        # the same however deep it is. Pages past the hot table read from archives.
+        messages = Message.objects.filter(group=group)
+        cursor = decode_cursor(before) if before else None
+        if cursor:
+            created_at, message_id = cursor
+            messages = messages.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=message_id))
+        page = list(messages.select_related("sender").order_by("-created_at", "-id")[:first + 1])
+        if len(page) <= first:
+            # Hot history is exhausted; carry on into the archived months.
+            if page:
+                cursor = (page[-1].created_at, page[-1].id)
+            page += MessageArchiveService.read_before(group, cursor, first + 1 - len(page))
+        if len(page) > first:
+            page = page[:first]
+            return page, encode_cursor(page[-1])
+        return page, None
+
+
+def encode_cursor(message: Message) -> str:
+    return base64.urlsafe_b64encode(f"{message.created_at.isoformat()}|{message.id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        created_at, message_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), str(uuid.UUID(message_id))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValidationError("Invalid cursor")
@@ -0,0 +1,24 @@
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .base import BaseSMSBackend
+
+__all__ = ["BaseSMSBackend", "get_backend"]
+
+_backends: dict[tuple, BaseSMSBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(path: str = None, **options) -> BaseSMSBackend:
+    path = path or getattr(settings, "SMS_BACKEND", "apps.sms.backends.twilio.TwilioBackend")
+    key = (path, tuple(sorted((k, v) for k, v in options.items() if v)))
+    backend = _backends.get(key)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.get(key)
+            if backend is None:
+                backend = import_string(path)(**{k: v for k, v in options.items() if v})
+                _backends[key] = backend
+    return backend
@@ -0,0 +1,36 @@
+from django.conf import settings
+
+from core.exceptions import ExternalServiceError
+
+from ..clients import get_request_validator
+
+__all__ = ["BaseSMSBackend"]
+
+
+class BaseSMSBackend:
+    supports_batch = False
+
+    def __init__(self, account_sid: str = None, auth_token: str = None):
+        self.account_sid = account_sid or getattr(settings, "TWILIO_ACCOUNT_SID", "")
+        self.auth_token = auth_token or getattr(settings, "TWILIO_AUTH_TOKEN", "")
+
+    def send(self, to: str, body: str, from_number: str, status_callback: str = "") -> str:
+        raise NotImplementedError
+
+    def send_batch(
+        self,
+        messages: list[tuple[str, str, str]],
+        status_callback: str = "",
+    ) -> list[str | ExternalServiceError]:
+        results = []
+        for to, body, from_number in messages:
+            try:
+                results.append(self.send(to, body, from_number, status_callback))
+            except ExternalServiceError as e:
+                results.append(e)
+        return results
+
+    def validate_signature(self, url: str, params: dict, signature: str) -> bool:
+        # Inbound requests are signed the Twilio way regardless of backend, so load
+        # tests exercise the same validation path as production.
+        return get_request_validator(self.auth_token).validate(url, params, signature)
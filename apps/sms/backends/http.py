@@ -0,0 +1,52 @@
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from core.exceptions import ExternalServiceError, TransientServiceError
+
+from .base import BaseSMSBackend
+
+__all__ = ["HTTPStandInBackend"]
+
+
+# Talks to the local stand-in server started by `manage.py sms_standin`.
+class HTTPStandInBackend(BaseSMSBackend):
+    supports_batch = True
+
+    def __init__(self, account_sid: str = None, auth_token: str = None):
+        super().__init__(account_sid, auth_token)
+        self.base_url = getattr(settings, "SMS_STANDIN_URL", "http://127.0.0.1:8025").rstrip("/")
+        self.timeout = getattr(settings, "TWILIO_HTTP_TIMEOUT", 10.0)
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(
+            pool_maxsize=getattr(settings, "TWILIO_HTTP_POOL_SIZE", 32),
+            pool_block=True,
+        ))
+
+    def send(self, to: str, body: str, from_number: str, status_callback: str = "") -> str:
+        data = self._post("/messages", {"to": to, "from": from_number, "body": body})
+        return data["sid"]
+
+    def send_batch(self, messages: list[tuple[str, str, str]], status_callback: str = "") -> list[str | ExternalServiceError]:
+        data = self._post("/messages/batch", {
+            "messages": [{"to": to, "from": from_number, "body": body} for to, body, from_number in messages],
+        })
+        return [
+            item["sid"] if "sid" in item else _error(item.get("status", 500), item.get("error", ""))
+            for item in data["results"]
+        ]
+
+    def _post(self, path: str, payload: dict) -> dict:
+        try:
+            response = self.session.post(f"{self.base_url}{path}", json=payload, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise TransientServiceError(f"Failed to send SMS: {e}") from e
+        if response.status_code >= 400:
+            raise _error(response.status_code, response.text)
+        return response.json()
+
+
+def _error(status: int, detail: str) -> ExternalServiceError:
+    if status == 429 or status >= 500:
+        return TransientServiceError(f"Failed to send SMS: HTTP {status} {detail}")
+    return ExternalServiceError(f"Failed to send SMS: HTTP {status} {detail}")
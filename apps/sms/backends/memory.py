@@ -0,0 +1,32 @@
+import itertools
+import threading
+
+from .base import BaseSMSBackend
+
+__all__ = ["InMemoryBackend"]
+
+
+# Records sends instead of delivering them; inspect InMemoryBackend.outbox.
+class InMemoryBackend(BaseSMSBackend):
+    supports_batch = True
+
+    outbox: list[dict] = []
+    _lock = threading.Lock()
+    _counter = itertools.count(1)
+
+    def send(self, to: str, body: str, from_number: str, status_callback: str = "") -> str:
+        return self.send_batch([(to, body, from_number)], status_callback)[0]
+
+    def send_batch(self, messages: list[tuple[str, str, str]], status_callback: str = "") -> list[str]:
+        with self._lock:
+            sids = []
+            for to, body, from_number in messages:
+                sid = f"SM{next(self._counter):032x}"
+                self.outbox.append({"sid": sid, "to": to, "from": from_number, "body": body})
+                sids.append(sid)
+            return sids
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls.outbox.clear()
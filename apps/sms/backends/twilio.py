@@ -0,0 +1,28 @@
+from requests.exceptions import RequestException
+from twilio.base.exceptions import TwilioRestException
+from twilio.rest import Client
+
+from core.exceptions import ExternalServiceError, TransientServiceError
+
+from ..clients import get_twilio_client
+from .base import BaseSMSBackend
+
+__all__ = ["TwilioBackend"]
+
+
+class TwilioBackend(BaseSMSBackend):
+    @property
+    def client(self) -> Client:
+        return get_twilio_client(self.account_sid, self.auth_token)
+
+    def send(self, to: str, body: str, from_number: str, status_callback: str = "") -> str:
+        options = {"status_callback": status_callback} if status_callback else {}
+        try:
+            message = self.client.messages.create(body=body, from_=from_number, to=to, **options)
+            return message.sid
+        except TwilioRestException as e:
+            if e.status == 429 or e.status >= 500:
+                raise TransientServiceError(f"Failed to send SMS: {e}") from e
+            raise ExternalServiceError(f"Failed to send SMS: {e}") from e
+        except RequestException as e:
+            raise TransientServiceError(f"Failed to send SMS: {e}") from e
@@ -0,0 +1,43 @@
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from twilio.http.http_client import TwilioHttpClient
+from twilio.request_validator import RequestValidator
+from twilio.rest import Client
+
+__all__ = ["get_twilio_client", "get_request_validator"]
+
+_clients: dict[tuple[str, str], Client] = {}
+_clients_lock = threading.Lock()
+
+
+def get_twilio_client(account_sid: str, auth_token: str) -> Client:
+    key = (account_sid, auth_token)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = Client(account_sid, auth_token, http_client=_build_http_client())
+                _clients[key] = client
+    return client
+
+
+@lru_cache(maxsize=None)
+def get_request_validator(auth_token: str) -> RequestValidator:
+    return RequestValidator(auth_token)
+
+
+def _build_http_client() -> TwilioHttpClient:
+    http_client = TwilioHttpClient(
+        pool_connections=True,
+        timeout=getattr(settings, "TWILIO_HTTP_TIMEOUT", 10.0),
+    )
+    # Block instead of opening throwaway connections when every pooled one is busy.
+    http_client.session.mount("https://", HTTPAdapter(
+        pool_maxsize=getattr(settings, "TWILIO_HTTP_POOL_SIZE", 32),
+        pool_block=True,
+    ))
+    return http_client
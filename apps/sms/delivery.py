@@ -0,0 +1,133 @@
+import atexit
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import SMSDelivery
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["DeliveryService", "StatusBuffer", "get_status_buffer"]
+
+
+class DeliveryService:
+    @staticmethod
+    def record_sends(deliveries: list[SMSDelivery]) -> None:
+        if not deliveries:
+            return
+        # A status callback can beat us here; fill in the send details without touching its status.
+        SMSDelivery.objects.bulk_create(
+            deliveries,
+            update_conflicts=True,
+            unique_fields=["sid"],
+            update_fields=["message", "to_number", "from_number", "segments"],
+        )
+
+    @staticmethod
+    def apply_status_updates(updates: dict[str, tuple[str, str]]) -> int:
+        if not updates:
+            return 0
+
+        now = timezone.now()
+        by_status = defaultdict(list)
+        for sid, (status, error_code) in updates.items():
+            # Whatever the provider sends has to fit the column, or the whole batch fails.
+            by_status[(status[:_STATUS_LENGTH], error_code)].append(sid)
+
+        # Callbacks for sends we haven't recorded yet; the updates below then treat
+        # them like any other row.
+        existing = set(SMSDelivery.objects.filter(sid__in=list(updates)).values_list("sid", flat=True))
+        SMSDelivery.objects.bulk_create(
+            [
+                SMSDelivery(sid=sid, status=status, error_code=error_code)
+                for (status, error_code), sids in by_status.items()
+                for sid in sids
+                if sid not in existing
+            ],
+            ignore_conflicts=True,
+        )
+        # Each process buffers its own callbacks, so the rank check happens in the
+        # UPDATE itself: a row already at a higher status is left alone.
+        updated = 0
+        for (status, error_code), sids in by_status.items():
+            higher = [known for known, rank in SMSDelivery.STATUS_RANK.items() if rank > _rank(status)]
+            updated += (
+                SMSDelivery.objects
+                .filter(sid__in=sids)
+                .exclude(status__in=higher)
+                .update(status=status, error_code=error_code, updated_at=now)
+            )
+        return updated
+
+
+class StatusBuffer:
+    def __init__(self, max_size: int = None, max_age: float = None):
+        self.max_size = max_size or getattr(settings, "SMS_STATUS_BUFFER_SIZE", 500)
+        self.max_age = max_age if max_age is not None else getattr(settings, "SMS_STATUS_BUFFER_SECONDS", 2.0)
+        self._pending: dict[str, tuple[str, str]] = {}
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def add(self, sid: str, status: str, error_code: str = "") -> None:
+        with self._lock:
+            current = self._pending.get(sid)
+            if current is None or _rank(status) >= _rank(current[0]):
+                self._pending[sid] = (status, error_code)
+            full = len(self._pending) >= self.max_size
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.max_age, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return 0
+        try:
+            return DeliveryService.apply_status_updates(pending)
+        except Exception:
+            # Every callback in the batch was already acknowledged, so keep the updates
+            # for the next flush rather than losing them.
+            logger.exception("Failed to write %d delivery status updates; will retry", len(pending))
+            with self._lock:
+                for sid, (status, error_code) in pending.items():
+                    current = self._pending.get(sid)
+                    if current is None or _rank(status) > _rank(current[0]):
+                        self._pending[sid] = (status, error_code)
+                if self._timer is None:
+                    self._timer = threading.Timer(self.max_age, self._flush_from_timer)
+                    self._timer.daemon = True
+                    self._timer.start()
+            return 0
+
+    def _flush_from_timer(self) -> None:
+        # Runs on the timer's own thread, which must not leak its DB connection.
+        try:
+            self.flush()
+        finally:
+            connection.close()
+
+
+_STATUS_LENGTH = SMSDelivery._meta.get_field("status").max_length
+
+
+def _rank(status: str) -> int:
+    return SMSDelivery.STATUS_RANK.get(status, -1)
+
+
+_buffer = StatusBuffer()
+atexit.register(_buffer.flush)
+
+
+def get_status_buffer() -> StatusBuffer:
+    return _buffer
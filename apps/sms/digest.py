@@ -0,0 +1,56 @@
+import time
+
+from django.conf import settings
+
+from .encoding import segment_count
+from .models import OutboundSMS
+
+__all__ = ["DigestBuffer", "combine_bodies"]
+
+
+def combine_bodies(jobs: list[OutboundSMS]) -> str:
+    return "\n".join(job.body for job in jobs)
+
+
+class DigestBuffer:
+    # Keyed on (recipient, pinned sender): texts from groups with their own number
+    # must come from that number, so they never share a digest with other groups.
+    def __init__(self, window: float = None, max_segments: int = None):
+        self.window = window if window is not None else getattr(settings, "SMS_DIGEST_WINDOW_SECONDS", 60.0)
+        self.max_segments = max_segments or getattr(settings, "SMS_DIGEST_MAX_SEGMENTS", 3)
+        self._jobs: dict[tuple[str, str], list[OutboundSMS]] = {}
+        self._opened: dict[tuple[str, str], float] = {}
+
+    def __len__(self):
+        return sum(len(jobs) for jobs in self._jobs.values())
+
+    def add(self, job: OutboundSMS) -> list[list[OutboundSMS]]:
+        key = (job.to_number, job.from_number)
+        ready = []
+        if segment_count(job.body) >= self.max_segments:
+            # Too long to share a digest; anything already waiting for this thread goes first.
+            if key in self._jobs:
+                ready.append(self._pop(key))
+            ready.append([job])
+            return ready
+
+        pending = self._jobs.get(key, [])
+        if pending and segment_count(combine_bodies(pending + [job])) > self.max_segments:
+            ready.append(self._pop(key))
+
+        if key not in self._jobs:
+            self._jobs[key] = []
+            self._opened[key] = time.monotonic()
+        self._jobs[key].append(job)
+        return ready
+
+    def due(self) -> list[list[OutboundSMS]]:
+        cutoff = time.monotonic() - self.window
+        return [self._pop(key) for key, opened in list(self._opened.items()) if opened <= cutoff]
+
+    def drain(self) -> list[list[OutboundSMS]]:
+        return [self._pop(key) for key in list(self._jobs)]
+
+    def _pop(self, key: tuple[str, str]) -> list[OutboundSMS]:
+        self._opened.pop(key, None)
+        return self._jobs.pop(key)
@@ -0,0 +1,149 @@
+import math
+
+from django.conf import settings
+
+__all__ = [
+    "GSM7",
+    "UCS2",
+    "EncodedBody",
+    "encode_body",
+    "detect_encoding",
+    "is_gsm7",
+    "segment_count",
+    "split_body",
+    "substitute_lookalikes",
+]
+
+GSM7 = "GSM-7"
+UCS2 = "UCS-2"
+
+GSM7_BASIC = frozenset(
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+# Extension table characters cost an escape septet plus the character itself.
+GSM7_EXTENDED = frozenset("^{}\\[~]|€\f")
+
+SEGMENT_LIMITS = {
+    GSM7: (160, 153),
+    UCS2: (70, 67),
+}
+
+LOOKALIKES = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201a": "'", "\u201b": "'", "\u2032": "'", "`": "'",
+    "\u201c": '"', "\u201d": '"', "\u201e": '"', "\u201f": '"', "\u2033": '"',
+    "\u00ab": '"', "\u00bb": '"', "\u2039": "'", "\u203a": "'",
+    "\u2010": "-", "\u2011": "-", "\u2012": "-", "\u2013": "-", "\u2014": "-", "\u2015": "-", "\u2212": "-",
+    "\u2022": "-", "\u00b7": "-",
+    "\u2026": "...",
+    "\u00a0": " ", "\u2002": " ", "\u2003": " ", "\u2009": " ", "\u200a": " ", "\u202f": " ",
+    "\u200b": "", "\ufeff": "",
+    "\u00e1": "a", "\u00ed": "i", "\u00f3": "o", "\u00fa": "u", "\u00e7": "\u00c7",
+})
+
+
+class EncodedBody:
+    def __init__(self, text: str):
+        self.text = text
+        self.encoding = detect_encoding(text)
+        self.segments = segment_count(text)
+
+    def __repr__(self):
+        return f"EncodedBody({self.encoding}, {self.segments} segment(s), {len(self.text)} chars)"
+
+
+def is_gsm7(text: str) -> bool:
+    return all(char in GSM7_BASIC or char in GSM7_EXTENDED for char in text)
+
+
+def detect_encoding(text: str) -> str:
+    return GSM7 if is_gsm7(text) else UCS2
+
+
+def _char_cost(char: str, encoding: str) -> int:
+    if encoding == GSM7:
+        return 2 if char in GSM7_EXTENDED else 1
+    return 2 if ord(char) > 0xFFFF else 1
+
+
+def _units(text: str, encoding: str) -> int:
+    return sum(_char_cost(char, encoding) for char in text)
+
+
+def segment_count(text: str) -> int:
+    if not text:
+        return 0
+    encoding = detect_encoding(text)
+    single, multi = SEGMENT_LIMITS[encoding]
+    units = _units(text, encoding)
+    return 1 if units <= single else math.ceil(units / multi)
+
+
+def substitute_lookalikes(text: str) -> str:
+    substituted = text.translate(LOOKALIKES)
+    # Only worth it if the whole body drops to GSM-7; otherwise keep the original characters.
+    return substituted if is_gsm7(substituted) else text
+
+
+def split_body(text: str, max_length: int = 1600, max_segments: int = None) -> list[str]:
+    encoding = detect_encoding(text)
+    budget = _unit_budget(encoding, max_segments)
+    if len(text) <= max_length and _units(text, encoding) <= budget:
+        return [text]
+
+    total = 2
+    while True:
+        prefix_width = len(f"({total}/{total}) ")
+        chunks = None
+        for at_words in (True, False):
+            chunks = _chunk(text, encoding, max_length - prefix_width, budget - prefix_width, at_words)
+            if chunks is not None and len(chunks) <= total:
+                return [f"({i}/{len(chunks)}) {chunk}" for i, chunk in enumerate(chunks, start=1)]
+        if chunks is None:
+            raise ValueError("Message body cannot be split within the given limits")
+        total += 1
+
+
+def _unit_budget(encoding: str, max_segments: int = None) -> int:
+    single, multi = SEGMENT_LIMITS[encoding]
+    if not max_segments:
+        return math.inf
+    return single if max_segments == 1 else multi * max_segments
+
+
+def _chunk(text: str, encoding: str, max_length: int, budget: int, at_words: bool) -> list[str] | None:
+    if max_length <= 0 or budget <= 0:
+        return None
+
+    chunks = []
+    remaining = text
+    while remaining:
+        end, units = 0, 0
+        while end < len(remaining) and end < max_length:
+            cost = _char_cost(remaining[end], encoding)
+            if units + cost > budget:
+                break
+            units += cost
+            end += 1
+
+        if end == 0:
+            return None
+        if end < len(remaining) and at_words:
+            space = remaining.rfind(" ", 0, end + 1)
+            if space > 0 and remaining[:space].strip():
+                end = space
+
+        chunks.append(remaining[:end].rstrip())
+        remaining = remaining[end:].lstrip()
+    return chunks
+
+
+def encode_body(text: str) -> list[EncodedBody]:
+    if getattr(settings, "SMS_GSM7_SUBSTITUTION", False):
+        text = substitute_lookalikes(text)
+    parts = split_body(
+        text,
+        max_length=getattr(settings, "SMS_MAX_BODY_LENGTH", 1600),
+        max_segments=getattr(settings, "SMS_MAX_SEGMENTS_PER_PART", 10),
+    )
+    return [EncodedBody(part) for part in parts]
@@ -0,0 +1,230 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.messages.services import MessageService
+from apps.users.services import UserService
+
+from .models import InboundSMS, OutboundSMS
+from .outbox import OutboxService
+from .ratelimit import get_inbound_limits
+from .routing import SMSRouter
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["InboundService"]
+
+SEND_ERROR_REPLY = "Sorry, there was an error sending your message. Please try again."
+
+
+class InboundService:
+    @staticmethod
+    def process(from_number: str, body: str, to_number: str = "", routed: tuple = None) -> str:
+        # `routed` is an earlier route() result for this text, so its rate-limit hits
+        # aren't counted again.
+        post, reply = routed or InboundService.route(from_number, body, to_number)
+        if post is None:
+            return reply
+
+        user, group, content = post
+        try:
+            MessageService.send_message(sender=user, group=group, content=content)
+            return ""
+        except Exception:
+            return SEND_ERROR_REPLY
+
+    @staticmethod
+    def route(from_number: str, body: str, to_number: str = "", recent_group=None) -> tuple[tuple | None, str]:
+        # Returns ((user, group, content), "") for a text to post, or (None, reply).
+        # `recent_group` is where an earlier, not yet posted text from this sender is
+        # going; posting it will make that the sender's last active group.
+        sender_limit, group_limit = get_inbound_limits()
+        # Over the limit, the sender hears about it once per window and is then dropped.
+        if not sender_limit.hit(from_number):
+            if sender_limit.notify_once(from_number):
+                return None, "You're sending messages too quickly. Please wait a minute and try again."
+            return None, ""
+
+        user = UserService.get_user_by_phone(from_number)
+        if not user:
+            return None, "This phone number is not registered. Sign up at the website to join."
+        if recent_group is not None:
+            user.last_active_group = recent_group
+            user.last_active_at = timezone.now()
+
+        group, content = SMSRouter.get_target_group(user, body, to_number)
+
+        if not group:
+            return None, SMSRouter.get_clarification_message(user)
+
+        if not content or not content.strip():
+            return None, "Message cannot be empty."
+
+        if not group_limit.hit(str(group.id)):
+            if group_limit.notify_once(f"{group.id}:{from_number}"):
+                return None, f"{group.name} is busy right now. Please wait a minute and try again."
+            return None, ""
+
+        return (user, group, content), ""
+
+    @staticmethod
+    def seen(message_sid: str) -> bool:
+        if not message_sid:
+            return False
+        # cache.add is atomic: only the first request for a sid gets to claim it.
+        ttl = getattr(settings, "SMS_INBOUND_DEDUP_TTL", 3600)
+        return not cache.add(_seen_key(message_sid), 1, ttl)
+
+    @staticmethod
+    def forget(message_sid: str) -> None:
+        if message_sid:
+            cache.delete(_seen_key(message_sid))
+
+    @staticmethod
+    def store(params: dict, status: str = InboundSMS.Status.PENDING) -> InboundSMS | None:
+        try:
+            with transaction.atomic():
+                return InboundSMS.objects.create(
+                    message_sid=params.get("MessageSid", ""),
+                    from_number=params.get("From", ""),
+                    to_number=params.get("To", ""),
+                    body=params.get("Body", ""),
+                    payload=params,
+                    status=status,
+                )
+        except IntegrityError:
+            return None
+
+    @staticmethod
+    def receive(params: dict) -> str | None:
+        message_sid = params.get("MessageSid", "")
+        try:
+            with transaction.atomic():
+                inbound = InboundService.store(params, status=InboundSMS.Status.PROCESSING)
+                if inbound is None:
+                    return None
+
+                reply = InboundService.process(inbound.from_number, inbound.body, inbound.to_number)
+                inbound.status = InboundSMS.Status.PROCESSED
+                inbound.reply = reply
+                inbound.processed_at = timezone.now()
+                inbound.save(update_fields=["status", "reply", "processed_at"])
+                return reply
+        except Exception:
+            # Nothing was committed, so let Twilio's retry through.
+            InboundService.forget(message_sid)
+            raise
+
+    @staticmethod
+    def claim_batch(limit: int = None, linger: float = None) -> list[InboundSMS]:
+        limit = limit or getattr(settings, "SMS_INBOUND_BATCH_SIZE", 50)
+        linger = getattr(settings, "SMS_INBOUND_BATCH_LINGER", 0.0) if linger is None else linger
+        inbound = InboundService._claim(limit)
+        # A burst trickles in over a few milliseconds; wait once for it to fill the batch.
+        if inbound and len(inbound) < limit and linger:
+            time.sleep(linger)
+            inbound += InboundService._claim(limit - len(inbound))
+        return inbound
+
+    @staticmethod
+    def _claim(limit: int) -> list[InboundSMS]:
+        lease = getattr(settings, "SMS_OUTBOX_LEASE_SECONDS", 300)
+        now = timezone.now()
+
+        with transaction.atomic():
+            inbound = list(
+                InboundSMS.objects
+                .select_for_update(skip_locked=True)
+                .filter(status__in=[InboundSMS.Status.PENDING, InboundSMS.Status.PROCESSING])
+                .exclude(locked_until__gte=now)
+                .order_by("created_at")[:limit]
+            )
+            if not inbound:
+                return []
+
+            locked_until = now + timedelta(seconds=lease)
+            InboundSMS.objects.filter(id__in=[sms.id for sms in inbound]).update(
+                status=InboundSMS.Status.PROCESSING,
+                locked_until=locked_until,
+            )
+
+        for sms in inbound:
+            sms.status = InboundSMS.Status.PROCESSING
+            sms.locked_until = locked_until
+        return inbound
+
+    @staticmethod
+    def handle_batch(inbound: list[InboundSMS]) -> None:
+        # Routes the whole batch, then posts every routed text with one MessageService
+        # call. If anything fails, each SMS is retried on its own so one bad row
+        # can't fail the rest. Routing happens once, outside the transaction: its
+        # rate-limit counters live in the cache and wouldn't roll back with it.
+        # A sender's unprefixed follow-up goes where their previous text in the batch
+        # went, as it would if the texts were handled one at a time.
+        routed, recent = [], {}
+        for sms in inbound:
+            try:
+                result = InboundService.route(sms.from_number, sms.body, sms.to_number, recent.get(sms.from_number))
+            except Exception:
+                logger.exception("Failed to route inbound SMS %s", sms.id)
+                result = None
+            if result and result[0]:
+                recent[sms.from_number] = result[0][1]
+            routed.append(result)
+        if None not in routed:
+            try:
+                InboundService._post_batch(inbound, routed)
+                return
+            except Exception:
+                logger.exception("Failed to process a batch of %d inbound SMS; retrying one by one", len(inbound))
+        for sms, result in zip(inbound, routed):
+            InboundService.handle(sms, routed=result)
+
+    @staticmethod
+    def _post_batch(inbound: list[InboundSMS], routed: list[tuple]) -> None:
+        with transaction.atomic():
+            results = iter(MessageService.send_messages([post for post, _ in routed if post]))
+
+            now = timezone.now()
+            replies = []
+            for sms, (post, reply) in zip(inbound, routed):
+                if post is not None and isinstance(next(results), Exception):
+                    reply = SEND_ERROR_REPLY
+                if reply:
+                    replies.extend(OutboxService.build([sms.from_number], reply, from_number=sms.to_number))
+                sms.status = InboundSMS.Status.PROCESSED
+                sms.reply = reply
+                sms.locked_until = None
+                sms.processed_at = now
+            OutboundSMS.objects.bulk_create(replies)
+            InboundSMS.objects.bulk_update(inbound, ["status", "reply", "locked_until", "processed_at"])
+
+    @staticmethod
+    def handle(inbound: InboundSMS, routed: tuple = None) -> None:
+        try:
+            # The posted message, its outbox jobs and the reply commit together, so a
+            # crash mid-way leaves the inbound SMS to be retried rather than half-applied.
+            with transaction.atomic():
+                reply = InboundService.process(inbound.from_number, inbound.body, inbound.to_number, routed=routed)
+                if reply:
+                    OutboxService.enqueue([inbound.from_number], reply, from_number=inbound.to_number)
+                inbound.status = InboundSMS.Status.PROCESSED
+                inbound.reply = reply
+                inbound.locked_until = None
+                inbound.processed_at = timezone.now()
+                inbound.save(update_fields=["status", "reply", "locked_until", "processed_at"])
+        except Exception as e:
+            logger.exception("Failed to process inbound SMS %s", inbound.id)
+            inbound.status = InboundSMS.Status.FAILED
+            inbound.last_error = str(e)
+            inbound.locked_until = None
+            inbound.save(update_fields=["status", "last_error", "locked_until"])
+
+
+def _seen_key(message_sid: str) -> str:
+    return f"sms:inbound:seen:{message_sid}"
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.sms.models import DeadLetterSMS
+from apps.sms.outbox import OutboxService
+
+
+class Command(BaseCommand):
+    help = "List SMS sends that failed permanently, optionally requeueing them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", help="Only show dead letters for this recipient number.")
+        parser.add_argument("--retryable", action="store_true", help="Only show sends that exhausted their retries.")
+        parser.add_argument("--limit", type=int, default=50)
+        parser.add_argument("--requeue", action="store_true", help="Move the listed sends back into the outbox.")
+
+    def handle(self, *args, **options):
+        dead_letters = DeadLetterSMS.objects.order_by("-created_at")
+        if options["number"]:
+            dead_letters = dead_letters.filter(to_number=options["number"])
+        if options["retryable"]:
+            dead_letters = dead_letters.filter(retryable=True)
+        dead_letters = list(dead_letters[:options["limit"]])
+
+        for dead_letter in dead_letters:
+            self.stdout.write(
+                f"{dead_letter.created_at:%Y-%m-%d %H:%M:%S} {dead_letter.to_number} "
+                f"attempts={dead_letter.attempts} {dead_letter.error}"
+            )
+
+        if options["requeue"] and dead_letters:
+            with transaction.atomic():
+                for dead_letter in dead_letters:
+                    OutboxService.enqueue([dead_letter.to_number], dead_letter.body, message=dead_letter.message)
+                DeadLetterSMS.objects.filter(id__in=[d.id for d in dead_letters]).delete()
+            self.stdout.write(self.style.SUCCESS(f"Requeued {len(dead_letters)} SMS"))
@@ -0,0 +1,255 @@
+import itertools
+import random
+import statistics
+import threading
+import time
+import uuid
+
+import phonenumbers
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from twilio.request_validator import RequestValidator
+
+from apps.groups.models import Group, Membership
+from apps.groups.services import GroupService
+from apps.messages.models import Message
+from apps.sms.backends.memory import InMemoryBackend
+from apps.sms.models import InboundSMS, OutboundSMS
+
+User = get_user_model()
+
+GROUP_PREFIX = "loadtest-"
+LOAD_TEST_TOKEN = "loadtest-auth-token"
+# Seeded users get NANP 555-0100..0199 numbers, which are reserved for fiction in
+# every area code and still pass phone validation, so nothing here can text a person.
+FICTIONAL_PHONE_REGEX = r"^\+1[2-9][0-9]{2}55501[0-9]{2}$"
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay signed Twilio inbound webhooks against twilio_webhook in-process at a target rate "
+        "and report throughput, latency and queries per request. Outbound SMS go to InMemoryBackend."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rate", type=float, default=50.0, help="Target inbound messages per second.")
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds to generate load for.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Threads issuing requests.")
+        parser.add_argument("--users", type=int, default=500)
+        parser.add_argument("--groups", type=int, default=50)
+        parser.add_argument("--groups-per-user", type=int, default=3)
+        parser.add_argument("--prefixed", type=float, default=0.5, help="Fraction of bodies with a #group prefix.")
+        parser.add_argument("--host", default=None, help="Host header; defaults to the first ALLOWED_HOSTS entry.")
+        parser.add_argument("--seed", type=int, default=None, help="Random seed for a reproducible body mix.")
+        parser.add_argument("--cleanup", action="store_true", help="Delete the seeded users and groups afterwards.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        host = options["host"] or next((h for h in settings.ALLOWED_HOSTS if h not in ("*", "")), "localhost")
+        auth_token = getattr(settings, "TWILIO_AUTH_TOKEN", "") or LOAD_TEST_TOKEN
+        to_number = getattr(settings, "TWILIO_PHONE_NUMBER", "") or "+12015550100"
+
+        population = self._seed(options, rng, to_number)
+        self.stdout.write(
+            f"Seeded {len(population)} users across {options['groups']} groups; "
+            f"replaying {options['rate']:g} msg/s for {options['duration']:g}s"
+        )
+
+        InMemoryBackend.reset()
+        outbox_before = OutboundSMS.objects.count()
+        messages_before = Message.objects.count()
+
+        # Sync delivery, so broadcasts go to InMemoryBackend during the run instead of
+        # waiting in the outbox for a real sms_worker.
+        with override_settings(
+            SMS_BACKEND="apps.sms.backends.memory.InMemoryBackend",
+            SMS_DELIVERY_MODE="sync",
+            TWILIO_AUTH_TOKEN=auth_token,
+        ):
+            path = reverse("twilio_webhook")
+            run = _LoadRun(
+                path=path,
+                url=f"http://{host}{path}",
+                host=host,
+                validator=RequestValidator(auth_token),
+                requests=self._requests(population, to_number, options, rng),
+                rate=options["rate"],
+            )
+            run.start(options["concurrency"])
+
+        self._report(run, Message.objects.count() - messages_before, OutboundSMS.objects.count() - outbox_before)
+        self._discard_unsent([phone for phone, _ in population])
+        if options["cleanup"]:
+            self._cleanup()
+
+    def _seed(self, options, rng, to_number: str) -> list[tuple[str, list[str]]]:
+        # Idempotent, so repeated runs reuse the same users and groups.
+        phones = _fictional_phones(options["users"], exclude=to_number)
+        users = []
+        for i, phone in enumerate(phones):
+            user = User(phone_number=phone, name=f"Load Test {i}", is_verified=True)
+            user.set_unusable_password()
+            users.append(user)
+        User.objects.bulk_create(users, ignore_conflicts=True, batch_size=500)
+        users = dict(User.objects.filter(phone_number__in=phones).values_list("phone_number", "id"))
+
+        names = [f"{GROUP_PREFIX}{i}" for i in range(options["groups"])]
+        Group.objects.bulk_create([Group(name=name) for name in names], ignore_conflicts=True)
+        groups = dict(Group.objects.filter(name__in=names).values_list("name", "id"))
+
+        population, memberships = [], []
+        per_user = min(options["groups_per_user"], len(names))
+        for phone in phones:
+            joined = rng.sample(names, per_user)
+            memberships.extend(Membership(user_id=users[phone], group_id=groups[name]) for name in joined)
+            population.append((phone, joined))
+        Membership.objects.bulk_create(memberships, ignore_conflicts=True, batch_size=1000)
+        # bulk_create bypasses MembershipService, so bring the group counters up to date.
+        GroupService.reconcile_counters(list(groups.values()))
+        return population
+
+    def _requests(self, population, to_number: str, options, rng) -> list[dict]:
+        count = int(options["rate"] * options["duration"])
+        requests = []
+        for i in range(count):
+            phone, joined = rng.choice(population)
+            body = f"load test message {i}"
+            if joined and rng.random() < options["prefixed"]:
+                body = f"#{rng.choice(joined)} {body}"
+            requests.append({
+                "MessageSid": f"SM{uuid.uuid4().hex}",
+                "AccountSid": getattr(settings, "TWILIO_ACCOUNT_SID", ""),
+                "From": phone,
+                "To": to_number,
+                "Body": body,
+                "NumMedia": "0",
+            })
+        return requests
+
+    def _report(self, run: "_LoadRun", messages: int, outbox: int) -> None:
+        latencies = sorted(run.latencies)
+        queries = sorted(run.queries)
+        if not latencies:
+            self.stdout.write("No requests completed")
+            return
+
+        self.stdout.write(
+            f"Requests: {len(latencies)} in {run.elapsed:.2f}s = {len(latencies) / run.elapsed:.1f} req/s "
+            f"(target {run.rate:g}), errors {run.errors}, max schedule lag {run.max_lag * 1000:.1f} ms"
+        )
+        self.stdout.write(
+            "Latency ms: " + ", ".join(
+                f"{label} {_percentile(latencies, p) * 1000:.1f}"
+                for label, p in (("p50", 50), ("p90", 90), ("p99", 99), ("max", 100))
+            )
+        )
+        self.stdout.write(
+            f"Queries/request: mean {statistics.mean(queries):.1f}, "
+            f"p99 {_percentile(queries, 99)}, max {queries[-1]}"
+        )
+        self.stdout.write(
+            f"Messages posted {messages}, outbox jobs queued {outbox}, "
+            f"inbound queued {InboundSMS.objects.filter(status=InboundSMS.Status.PENDING).count()}, "
+            f"sent to InMemoryBackend {len(InMemoryBackend.outbox)}"
+        )
+
+    def _discard_unsent(self, phones: list[str]) -> None:
+        # Replies and retries still queued for the seeded numbers, and texts stored for
+        # later processing, would otherwise be picked up by the next real sms_worker.
+        outbox, _ = OutboundSMS.objects.filter(
+            to_number__in=phones,
+            status__in=[OutboundSMS.Status.PENDING, OutboundSMS.Status.SENDING],
+        ).delete()
+        inbound, _ = InboundSMS.objects.filter(
+            from_number__in=phones,
+            status__in=[InboundSMS.Status.PENDING, InboundSMS.Status.PROCESSING],
+        ).delete()
+        if outbox or inbound:
+            self.stdout.write(f"Discarded {outbox} unsent outbox jobs and {inbound} unprocessed inbound SMS")
+
+    def _cleanup(self) -> None:
+        Group.objects.filter(name__startswith=GROUP_PREFIX).delete()
+        users = User.objects.filter(name__startswith="Load Test ", phone_number__regex=FICTIONAL_PHONE_REGEX)
+        count = users.count()
+        users.delete()
+        self.stdout.write(f"Removed load test groups and {count} users")
+
+
+class _LoadRun:
+    # Request i is due at start + i / rate; threads pull the next due request, so a
+    # slow server shows up as schedule lag rather than a silently lower rate.
+    def __init__(self, path: str, url: str, host: str, validator: RequestValidator, requests: list[dict], rate: float):
+        self.path = path
+        self.url = url
+        self.host = host
+        self.validator = validator
+        self.requests = requests
+        self.rate = rate
+        self.latencies: list[float] = []
+        self.queries: list[int] = []
+        self.errors = 0
+        self.max_lag = 0.0
+        self.elapsed = 0.0
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def start(self, concurrency: int) -> None:
+        self._start = time.perf_counter()
+        threads = [threading.Thread(target=self._worker) for _ in range(max(concurrency, 1))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.elapsed = time.perf_counter() - self._start
+
+    def _worker(self) -> None:
+        client = Client(HTTP_HOST=self.host)
+        try:
+            while True:
+                with self._lock:
+                    index = next(self._next)
+                if index >= len(self.requests):
+                    return
+
+                params = self.requests[index]
+                due = self._start + index / self.rate
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                signature = self.validator.compute_signature(self.url, params)
+
+                started = time.perf_counter()
+                with CaptureQueriesContext(connection) as captured:
+                    response = client.post(self.path, params, HTTP_X_TWILIO_SIGNATURE=signature)
+                latency = time.perf_counter() - started
+
+                with self._lock:
+                    self.max_lag = max(self.max_lag, started - due)
+                    self.latencies.append(latency)
+                    self.queries.append(len(captured))
+                    if response.status_code != 200:
+                        self.errors += 1
+        finally:
+            connection.close()
+
+
+def _fictional_phones(count: int, exclude: str = "") -> list[str]:
+    phones = []
+    for area in range(201, 1000):
+        for line in range(100, 200):
+            phone = f"+1{area}5550{line}"
+            if phone == exclude or not phonenumbers.is_valid_number(phonenumbers.parse(phone)):
+                continue
+            phones.append(phone)
+            if len(phones) == count:
+                return phones
+    raise CommandError(f"Only {len(phones)} fictional numbers are available for --users")
+
+
+def _percentile(values: list, percent: float):
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
@@ -0,0 +1,102 @@
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Run a local HTTP stand-in for the SMS provider (use with HTTPStandInBackend)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8025)
+        parser.add_argument("--latency-ms", type=float, default=150.0, help="Mean response latency.")
+        parser.add_argument("--jitter-ms", type=float, default=50.0)
+        parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of sends failing with a 500.")
+        parser.add_argument("--invalid-rate", type=float, default=0.0, help="Fraction of sends rejected with a 400.")
+        parser.add_argument("--mps", type=float, default=0.0, help="Per-sender limit; excess sends get a 429.")
+
+    def handle(self, *args, **options):
+        simulator = _Simulator(options)
+        server = ThreadingHTTPServer((options["host"], options["port"]), _handler_for(simulator))
+        server.daemon_threads = True
+        self.stdout.write(f"SMS stand-in listening on http://{options['host']}:{options['port']}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(json.dumps(simulator.counts))
+
+
+class _Simulator:
+    def __init__(self, options):
+        self.options = options
+        self.counts = {"sent": 0, "throttled": 0, "failed": 0, "invalid": 0}
+        self._sids = itertools.count(1)
+        self._windows: dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def delay(self) -> None:
+        latency = self.options["latency_ms"] + random.uniform(-1, 1) * self.options["jitter_ms"]
+        time.sleep(max(latency, 0) / 1000)
+
+    def send(self, message: dict) -> tuple[int, dict]:
+        with self._lock:
+            if self._over_limit(message.get("from", "")):
+                self.counts["throttled"] += 1
+                return 429, {"status": 429, "error": "Too Many Requests"}
+            roll = random.random()
+            if roll < self.options["error_rate"]:
+                self.counts["failed"] += 1
+                return 500, {"status": 500, "error": "Simulated provider error"}
+            if roll < self.options["error_rate"] + self.options["invalid_rate"]:
+                self.counts["invalid"] += 1
+                return 400, {"status": 400, "error": "Invalid 'To' phone number"}
+            self.counts["sent"] += 1
+            return 201, {"sid": f"SM{next(self._sids):032x}"}
+
+    def _over_limit(self, sender: str) -> bool:
+        mps = self.options["mps"]
+        if not mps:
+            return False
+        second = int(time.monotonic())
+        window, count = self._windows.get(sender, (second, 0))
+        if window != second:
+            window, count = second, 0
+        self._windows[sender] = (window, count + 1)
+        return count + 1 > mps
+
+
+def _handler_for(simulator: _Simulator):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            simulator.delay()
+            if self.path == "/messages":
+                status, body = simulator.send(payload)
+            elif self.path == "/messages/batch":
+                status, body = 200, {"results": [simulator.send(m)[1] for m in payload.get("messages", [])]}
+            else:
+                status, body = 404, {"error": "Not found"}
+            self._respond(status, body)
+
+        def _respond(self, status: int, body: dict):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
@@ -0,0 +1,78 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.sms.digest import DigestBuffer
+from apps.sms.inbound import InboundService
+from apps.sms.outbox import OutboxService
+from apps.sms.throttle import get_send_scheduler
+
+
+class Command(BaseCommand):
+    help = "Process queued inbound SMS and deliver queued outbound SMS from the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=getattr(settings, "SMS_OUTBOX_BATCH_SIZE", 100))
+        parser.add_argument("--poll-interval", type=float, default=getattr(settings, "SMS_OUTBOX_POLL_INTERVAL", 1.0))
+        parser.add_argument("--once", action="store_true", help="Drain the inbound queue and outbox once and exit.")
+
+    def handle(self, *args, **options):
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        digests = DigestBuffer()
+        if digests.window >= getattr(settings, "SMS_OUTBOX_LEASE_SECONDS", 300):
+            self.stderr.write("SMS_DIGEST_WINDOW_SECONDS should be shorter than SMS_OUTBOX_LEASE_SECONDS")
+
+        self.stdout.write("SMS worker started")
+        while not self._stopping:
+            close_old_connections()
+            inbound = InboundService.claim_batch()
+            if inbound:
+                InboundService.handle_batch(inbound)
+            if inbound:
+                self.stdout.write(f"Processed {len(inbound)} inbound SMS")
+
+            jobs = OutboxService.claim_batch(options["batch_size"])
+
+            batches = digests.due()
+            for job in jobs:
+                if job.digest:
+                    batches.extend(digests.add(job))
+                else:
+                    batches.append([job])
+            if batches:
+                self._deliver(batches, options["verbosity"])
+
+            if jobs or inbound:
+                continue
+            if options["once"]:
+                break
+            time.sleep(options["poll_interval"])
+
+        # Flush held digests on shutdown rather than waiting for their leases to expire.
+        remaining = digests.drain()
+        if remaining:
+            self._deliver(remaining, options["verbosity"])
+        self.stdout.write("SMS worker stopped")
+
+    def _deliver(self, batches, verbosity):
+        sent = OutboxService.deliver_batches(batches)
+        self.stdout.write(f"Delivered {sent}/{sum(len(batch) for batch in batches)} SMS in {len(batches)} sends")
+        if verbosity > 1:
+            self._write_throttle_stats()
+
+    def _write_throttle_stats(self):
+        for number, stats in get_send_scheduler().stats().items():
+            self.stdout.write(
+                f"  {number}: {stats['rate']:g} mps, queue depth {stats['queue_depth']}, "
+                f"{stats['delayed']}/{stats['acquired']} delayed, "
+                f"avg wait {stats['avg_wait']:.2f}s, max wait {stats['max_wait']:.2f}s"
+            )
+
+    def _stop(self, signum, frame):
+        self._stopping = True
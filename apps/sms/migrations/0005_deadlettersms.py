@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:14
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat_messages', '0001_initial'),
+        ('sms', '0004_outboundsms'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeadLetterSMS',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('to_number', models.CharField(max_length=20)),
+                ('body', models.TextField()),
+                ('error', models.TextField()),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('retryable', models.BooleanField(default=False, help_text='Failed on a transient error after exhausting retries')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='dead_letter_sms', to='chat_messages.message')),
+                ('outbound', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='dead_letters', to='sms.outboundsms')),
+            ],
+            options={
+                'db_table': 'sms_dead_letters',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['to_number', '-created_at'], name='sms_dead_le_to_numb_166755_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:15
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat_messages', '0001_initial'),
+        ('sms', '0005_deadlettersms'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SMSDelivery',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('sid', models.CharField(max_length=64, unique=True)),
+                ('to_number', models.CharField(blank=True, max_length=20)),
+                ('from_number', models.CharField(blank=True, max_length=20)),
+                ('status', models.CharField(choices=[('accepted', 'Accepted'), ('queued', 'Queued'), ('sending', 'Sending'), ('sent', 'Sent'), ('delivered', 'Delivered'), ('undelivered', 'Undelivered'), ('failed', 'Failed')], default='queued', max_length=12)),
+                ('error_code', models.CharField(blank=True, max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='chat_messages.message')),
+            ],
+            options={
+                'db_table': 'sms_deliveries',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['message', 'status'], name='sms_deliver_message_386088_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sms', '0006_smsdelivery'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='smsdelivery',
+            name='segments',
+            field=models.PositiveSmallIntegerField(default=1),
+        ),
+    ]
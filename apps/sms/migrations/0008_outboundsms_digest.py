@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sms', '0007_smsdelivery_segments'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboundsms',
+            name='digest',
+            field=models.BooleanField(default=False),
+        ),
+    ]
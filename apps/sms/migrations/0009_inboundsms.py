@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:20
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sms', '0008_outboundsms_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboundsms',
+            name='from_number',
+            field=models.CharField(blank=True, help_text='Pinned sender; blank uses the sender pool', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='InboundSMS',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('message_sid', models.CharField(blank=True, db_index=True, max_length=64)),
+                ('from_number', models.CharField(max_length=20)),
+                ('to_number', models.CharField(blank=True, max_length=20)),
+                ('body', models.TextField(blank=True)),
+                ('payload', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('processed', 'Processed'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('reply', models.TextField(blank=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'sms_inbound',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='sms_inbound_status_ecdcdd_idx')],
+            },
+        ),
+    ]
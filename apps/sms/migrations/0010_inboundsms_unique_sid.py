@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sms', '0009_inboundsms'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='inboundsms',
+            name='message_sid',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name='inboundsms',
+            constraint=models.UniqueConstraint(condition=models.Q(('message_sid', ''), _negated=True), fields=('message_sid',), name='unique_inbound_message_sid'),
+        ),
+    ]
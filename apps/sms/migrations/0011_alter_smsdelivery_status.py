@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sms', '0010_inboundsms_unique_sid'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='smsdelivery',
+            name='status',
+            field=models.CharField(choices=[('scheduled', 'Scheduled'), ('accepted', 'Accepted'), ('queued', 'Queued'), ('sending', 'Sending'), ('sent', 'Sent'), ('delivered', 'Delivered'), ('partially_delivered', 'Partially delivered'), ('undelivered', 'Undelivered'), ('failed', 'Failed'), ('canceled', 'Canceled'), ('read', 'Read')], default='queued', max_length=32),
+        ),
+    ]
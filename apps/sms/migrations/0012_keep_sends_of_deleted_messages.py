@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat_messages', '0005_message_search_index'),
+        ('sms', '0011_alter_smsdelivery_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboundsms',
+            name='message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='outbound_sms', to='chat_messages.message'),
+        ),
+        migrations.AlterField(
+            model_name='smsdelivery',
+            name='message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deliveries', to='chat_messages.message'),
+        ),
+    ]
@@ -0,0 +1,164 @@
+import uuid
+
+from django.db import models
+from django.utils import timezone
+
+
+class OutboundSMS(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENDING = "sending", "Sending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    message = models.ForeignKey(
+        "chat_messages.Message",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="outbound_sms",
+    )
+    to_number = models.CharField(max_length=20)
+    from_number = models.CharField(max_length=20, blank=True, help_text="Pinned sender; blank uses the sender pool")
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    digest = models.BooleanField(default=False)
+    attempts = models.PositiveIntegerField(default=0)
+    sid = models.CharField(max_length=64, blank=True)
+    last_error = models.TextField(blank=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "sms_outbox"
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["status", "available_at"])]
+
+    def __str__(self):
+        return f"SMS to {self.to_number} ({self.status})"
+
+
+class InboundSMS(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        PROCESSING = "processing", "Processing"
+        PROCESSED = "processed", "Processed"
+        FAILED = "failed", "Failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    message_sid = models.CharField(max_length=64, blank=True)
+    from_number = models.CharField(max_length=20)
+    to_number = models.CharField(max_length=20, blank=True)
+    body = models.TextField(blank=True)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    reply = models.TextField(blank=True)
+    last_error = models.TextField(blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "sms_inbound"
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["message_sid"],
+                condition=~models.Q(message_sid=""),
+                name="unique_inbound_message_sid",
+            ),
+        ]
+
+    def __str__(self):
+        return f"SMS from {self.from_number} ({self.status})"
+
+
+class DeadLetterSMS(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    outbound = models.ForeignKey(
+        OutboundSMS,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="dead_letters",
+    )
+    message = models.ForeignKey(
+        "chat_messages.Message",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="dead_letter_sms",
+    )
+    to_number = models.CharField(max_length=20)
+    body = models.TextField()
+    error = models.TextField()
+    attempts = models.PositiveIntegerField(default=0)
+    retryable = models.BooleanField(default=False, help_text="Failed on a transient error after exhausting retries")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = "sms_dead_letters"
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["to_number", "-created_at"])]
+
+    def __str__(self):
+        return f"Dead letter to {self.to_number}: {self.error[:50]}"
+
+
+class SMSDelivery(models.Model):
+    class Status(models.TextChoices):
+        SCHEDULED = "scheduled", "Scheduled"
+        ACCEPTED = "accepted", "Accepted"
+        QUEUED = "queued", "Queued"
+        SENDING = "sending", "Sending"
+        SENT = "sent", "Sent"
+        DELIVERED = "delivered", "Delivered"
+        PARTIALLY_DELIVERED = "partially_delivered", "Partially delivered"
+        UNDELIVERED = "undelivered", "Undelivered"
+        FAILED = "failed", "Failed"
+        CANCELED = "canceled", "Canceled"
+        READ = "read", "Read"
+
+    # Callbacks can arrive out of order; a lower-ranked status never overwrites a higher one.
+    STATUS_RANK = {
+        Status.SCHEDULED: 0,
+        Status.ACCEPTED: 0,
+        Status.QUEUED: 1,
+        Status.SENDING: 2,
+        Status.SENT: 3,
+        Status.DELIVERED: 4,
+        Status.PARTIALLY_DELIVERED: 4,
+        Status.UNDELIVERED: 4,
+        Status.FAILED: 4,
+        Status.CANCELED: 4,
+        Status.READ: 5,
+    }
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    sid = models.CharField(max_length=64, unique=True)
+    message = models.ForeignKey(
+        "chat_messages.Message",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="deliveries",
+    )
+    to_number = models.CharField(max_length=20, blank=True)
+    from_number = models.CharField(max_length=20, blank=True)
+    status = models.CharField(max_length=32, choices=Status.choices, default=Status.QUEUED)
+    segments = models.PositiveSmallIntegerField(default=1)
+    error_code = models.CharField(max_length=10, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "sms_deliveries"
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["message", "status"])]
+
+    def __str__(self):
+        return f"{self.sid} to {self.to_number} ({self.status})"
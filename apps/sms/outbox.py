@@ -0,0 +1,195 @@
+import logging
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.exceptions import ExternalServiceError, SendDeferred, TransientServiceError
+
+from .delivery import DeliveryService
+from .digest import combine_bodies
+from .encoding import segment_count
+from .models import DeadLetterSMS, OutboundSMS, SMSDelivery
+from .retry import RetryPolicy
+from .services import SMSService
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["OutboxService"]
+
+
+class OutboxService:
+    @staticmethod
+    def enqueue(
+        recipients: list[str],
+        body: str,
+        message=None,
+        digest: bool = False,
+        from_number: str = "",
+    ) -> list[OutboundSMS]:
+        return OutboundSMS.objects.bulk_create(
+            OutboxService.build(recipients, body, message=message, digest=digest, from_number=from_number)
+        )
+
+    @staticmethod
+    def build(
+        recipients: list[str],
+        body: str,
+        message=None,
+        digest: bool = False,
+        from_number: str = "",
+    ) -> list[OutboundSMS]:
+        # Unsaved jobs, for callers that batch several enqueues into one insert.
+        return [
+            OutboundSMS(message=message, to_number=phone, body=body, digest=digest, from_number=from_number)
+            for phone in dict.fromkeys(recipients)
+        ]
+
+    @staticmethod
+    def claim_batch(limit: int = None) -> list[OutboundSMS]:
+        limit = limit or getattr(settings, "SMS_OUTBOX_BATCH_SIZE", 100)
+        lease = getattr(settings, "SMS_OUTBOX_LEASE_SECONDS", 300)
+        now = timezone.now()
+
+        with transaction.atomic():
+            jobs = list(
+                OutboundSMS.objects
+                .select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=OutboundSMS.Status.PENDING)
+                    | Q(status=OutboundSMS.Status.SENDING, locked_until__lt=now),
+                    available_at__lte=now,
+                )
+                .order_by("available_at", "created_at")[:limit]
+            )
+            if not jobs:
+                return []
+
+            locked_until = now + timedelta(seconds=lease)
+            OutboundSMS.objects.filter(id__in=[job.id for job in jobs]).update(
+                status=OutboundSMS.Status.SENDING,
+                locked_until=locked_until,
+                attempts=F("attempts") + 1,
+                updated_at=now,
+            )
+
+        for job in jobs:
+            job.status = OutboundSMS.Status.SENDING
+            job.locked_until = locked_until
+            job.attempts += 1
+        return jobs
+
+    @staticmethod
+    def deliver(jobs: list[OutboundSMS], sms_service: SMSService = None, policy: RetryPolicy = None) -> int:
+        return OutboxService.deliver_batches([[job] for job in jobs], sms_service, policy)
+
+    @staticmethod
+    def deliver_batches(
+        batches: list[list[OutboundSMS]],
+        sms_service: SMSService = None,
+        policy: RetryPolicy = None,
+    ) -> int:
+        # Each batch goes out as a single SMS to its recipient; digests carry several jobs.
+        sms_service = sms_service or SMSService()
+        policy = policy or RetryPolicy()
+
+        # Batches with the same body and sender share one bulk send. A recipient's
+        # n-th batch goes in round n, so a number with several batches gets them in
+        # order, and the same text queued twice (someone sending "ok" twice) isn't
+        # collapsed into one send.
+        batches_by_body = defaultdict(list)
+        rounds = Counter()
+        for batch in batches:
+            phone = batch[0].to_number
+            batches_by_body[(combine_bodies(batch), batch[0].from_number, rounds[phone])].append(batch)
+            rounds[phone] += 1
+
+        jobs, dead_letters, deliveries = [], [], []
+        for (body, from_number, _), body_batches in batches_by_body.items():
+            sender = SMSService(from_number=from_number, backend=sms_service.backend) if from_number else sms_service
+            try:
+                results, errors = sender.send_bulk_detailed([batch[0].to_number for batch in body_batches], body)
+            except Exception as e:
+                logger.exception("Outbox delivery failed")
+                results, errors = {}, {batch[0].to_number: TransientServiceError(str(e)) for batch in body_batches}
+
+            now = timezone.now()
+            for batch in body_batches:
+                phone = batch[0].to_number
+                sid = results.get(phone)
+                error = None if sid else errors.get(phone) or ExternalServiceError("Send failed")
+                if sid:
+                    deliveries.append(SMSDelivery(
+                        sid=sid,
+                        message_id=batch[-1].message_id,
+                        to_number=phone,
+                        from_number=sender.sender_for(phone),
+                        segments=segment_count(body),
+                    ))
+
+                for job in batch:
+                    jobs.append(job)
+                    job.locked_until = None
+                    job.updated_at = now
+                    if sid:
+                        job.status = OutboundSMS.Status.SENT
+                        job.sid = sid
+                        job.last_error = ""
+                    elif isinstance(error, SendDeferred):
+                        # Paced, not failed: back in the queue without using up an attempt.
+                        job.status = OutboundSMS.Status.PENDING
+                        job.attempts -= 1
+                        job.available_at = now + timedelta(seconds=error.retry_after)
+                    elif policy.should_retry(error, job.attempts):
+                        job.status = OutboundSMS.Status.PENDING
+                        job.available_at = now + timedelta(seconds=policy.backoff(job.attempts))
+                        job.last_error = str(error)
+                    else:
+                        job.status = OutboundSMS.Status.FAILED
+                        job.last_error = str(error)
+                        dead_letters.append(OutboxService._dead_letter(job, error, policy, outbound=job))
+
+        with transaction.atomic():
+            OutboundSMS.objects.bulk_update(
+                jobs, ["status", "sid", "attempts", "last_error", "available_at", "locked_until", "updated_at"],
+            )
+            DeadLetterSMS.objects.bulk_create(dead_letters)
+            DeliveryService.record_sends(deliveries)
+        return sum(1 for job in jobs if job.status == OutboundSMS.Status.SENT)
+
+    @staticmethod
+    def record_failures(errors: dict[str, ExternalServiceError], body: str, message=None, policy: RetryPolicy = None) -> None:
+        policy = policy or RetryPolicy()
+        now = timezone.now()
+
+        retries, dead_letters = [], []
+        for phone, error in errors.items():
+            job = OutboundSMS(message=message, to_number=phone, body=body, attempts=1, last_error=str(error))
+            if isinstance(error, SendDeferred):
+                job.attempts = 0
+                job.last_error = ""
+                job.available_at = now + timedelta(seconds=error.retry_after)
+                retries.append(job)
+            elif policy.should_retry(error, job.attempts):
+                job.available_at = now + timedelta(seconds=policy.backoff(job.attempts))
+                retries.append(job)
+            else:
+                dead_letters.append(OutboxService._dead_letter(job, error, policy))
+
+        OutboundSMS.objects.bulk_create(retries)
+        DeadLetterSMS.objects.bulk_create(dead_letters)
+
+    @staticmethod
+    def _dead_letter(job: OutboundSMS, error: Exception, policy: RetryPolicy, outbound: OutboundSMS = None) -> DeadLetterSMS:
+        return DeadLetterSMS(
+            outbound=outbound,
+            message_id=job.message_id,
+            to_number=job.to_number,
+            body=job.body,
+            error=str(error),
+            attempts=job.attempts,
+            retryable=policy.is_retryable(error),
+        )
@@ -0,0 +1,61 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+__all__ = ["SlidingWindowLimit", "get_inbound_limits"]
+
+
+class SlidingWindowLimit:
+    # Sliding-window counter over two fixed windows in the shared cache, so the
+    # limit holds across workers: the previous window's count is weighted by how
+    # much of it still overlaps the sliding window.
+    def __init__(self, scope: str, limit: int, window: float):
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+
+    def hit(self, key: str) -> bool:
+        if self.limit <= 0:
+            return True
+
+        now = time.time()
+        bucket, offset = divmod(now, self.window)
+        current_key = self._key(key, int(bucket))
+        timeout = int(self.window * 2) + 1
+
+        cache.add(current_key, 0, timeout)
+        try:
+            count = cache.incr(current_key)
+        except ValueError:
+            # Evicted between add and incr.
+            cache.set(current_key, 1, timeout)
+            count = 1
+        previous = cache.get(self._key(key, int(bucket) - 1), 0)
+        return previous * (1 - offset / self.window) + count <= self.limit
+
+    def notify_once(self, key: str) -> bool:
+        # True for the first rejection per window, so a limited sender gets one reply.
+        return cache.add(f"sms:limit:{self.scope}:{key}:notified", 1, int(self.window) + 1)
+
+    def _key(self, key: str, bucket: int) -> str:
+        return f"sms:limit:{self.scope}:{key}:{bucket}"
+
+
+_limits: dict[tuple, tuple[SlidingWindowLimit, SlidingWindowLimit]] = {}
+
+
+def get_inbound_limits() -> tuple[SlidingWindowLimit, SlidingWindowLimit]:
+    config = (
+        getattr(settings, "SMS_INBOUND_SENDER_LIMIT", 0),
+        getattr(settings, "SMS_INBOUND_SENDER_WINDOW", 60.0),
+        getattr(settings, "SMS_INBOUND_GROUP_LIMIT", 0),
+        getattr(settings, "SMS_INBOUND_GROUP_WINDOW", 60.0),
+    )
+    if config not in _limits:
+        sender_limit, sender_window, group_limit, group_window = config
+        _limits[config] = (
+            SlidingWindowLimit("sender", sender_limit, sender_window),
+            SlidingWindowLimit("group", group_limit, group_window),
+        )
+    return _limits[config]
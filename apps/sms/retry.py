@@ -0,0 +1,26 @@
+import random
+
+from django.conf import settings
+
+from core.exceptions import TransientServiceError
+
+__all__ = ["RetryPolicy"]
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = None, base_delay: float = None, max_delay: float = None):
+        self.max_attempts = max_attempts or getattr(settings, "SMS_RETRY_MAX_ATTEMPTS", 5)
+        self.base_delay = base_delay if base_delay is not None else getattr(settings, "SMS_RETRY_BASE_DELAY", 2.0)
+        self.max_delay = max_delay if max_delay is not None else getattr(settings, "SMS_RETRY_MAX_DELAY", 300.0)
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        return isinstance(error, TransientServiceError)
+
+    def should_retry(self, error: Exception, attempts: int) -> bool:
+        return self.is_retryable(error) and attempts < self.max_attempts
+
+    def backoff(self, attempts: int) -> float:
+        # Full jitter: spreads retries from a burst of 429s across the whole window.
+        ceiling = min(self.max_delay, self.base_delay * 2 ** max(attempts - 1, 0))
+        return random.uniform(0, ceiling)
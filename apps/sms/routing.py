@@ -1,7 +1,11 @@
 import re
+import threading
+from datetime import timedelta
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Max
+from django.core.cache import cache
+from django.utils import timezone
 
 from apps.groups.models import Group
 
@@ -9,6 +13,73 @@ User = get_user_model()
 
 GROUP_PREFIX_PATTERN = re.compile(r"^#(\S+)\s+(.+)$", re.DOTALL)
 
+__all__ = ["InboundNumberTable", "RoutingCache", "SMSRouter", "get_inbound_numbers"]
+
+
+class RoutingCache:
+    # Per-user snapshot of active groups as (id, name, lowercased name).
+    @staticmethod
+    def get(user) -> dict:
+        routes = cache.get(_routes_key(user.id))
+        if routes is None:
+            routes = RoutingCache.load(user)
+        return routes
+
+    @staticmethod
+    def load(user) -> dict:
+        rows = (
+            Group.objects
+            .filter(memberships__user=user, memberships__is_active=True)
+            .values_list("id", "name")
+        )
+        routes = {"groups": [(str(group_id), name, name.lower()) for group_id, name in rows]}
+        cache.set(_routes_key(user.id), routes, _ttl())
+        return routes
+
+    @staticmethod
+    def invalidate(user_id) -> None:
+        cache.delete(_routes_key(user_id))
+
+
+class InboundNumberTable:
+    # Process-local map of dedicated inbound number -> group id. Assignments bump a
+    # version in the shared cache, and each process reloads on its next lookup.
+    def __init__(self):
+        self._routes: dict[str, str] = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    def group_id_for(self, number: str) -> str | None:
+        if not number:
+            return None
+        version = cache.get(_NUMBERS_VERSION_KEY, 0)
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._routes = self.load()
+                    self._version = version
+        return self._routes.get(number)
+
+    @staticmethod
+    def load() -> dict[str, str]:
+        rows = Group.objects.filter(inbound_number__isnull=False).values_list("inbound_number", "id")
+        return {number: str(group_id) for number, group_id in rows}
+
+    @staticmethod
+    def refresh() -> None:
+        cache.add(_NUMBERS_VERSION_KEY, 0, None)
+        try:
+            cache.incr(_NUMBERS_VERSION_KEY)
+        except ValueError:
+            cache.set(_NUMBERS_VERSION_KEY, 1, None)
+
+
+_inbound_numbers = InboundNumberTable()
+
+
+def get_inbound_numbers() -> InboundNumberTable:
+    return _inbound_numbers
+
 
 class SMSRouter:
     @staticmethod
@@ -23,47 +94,74 @@ class SMSRouter:
         return None, message
 
     @staticmethod
-    def get_target_group(user, message: str):
-        group_name, content = SMSRouter.parse_group_prefix(message)
+    def get_target_group(user, message: str, to_number: str = ""):
+        routes = RoutingCache.get(user)
+        user_groups = routes["groups"]
 
-        user_groups = list(Group.objects.filter(
-            memberships__user=user,
-            memberships__is_active=True,
-        ))
+        # A group's own number needs no prefix; non-members fall back to normal routing.
+        group_id = get_inbound_numbers().group_id_for(to_number)
+        if group_id and any(group_id == known_id for known_id, _, _ in user_groups):
+            return SMSRouter._load_group(user, group_id), (message or "").strip()
+
+        group_name, content = SMSRouter.parse_group_prefix(message)
 
         if not user_groups:
             return None, content
 
         if group_name:
-            for group in user_groups:
-                if group.name.lower() == group_name.lower():
-                    return group, content
-            for group in user_groups:
-                if group_name.lower() in group.name.lower():
-                    return group, content
+            group_name = group_name.lower()
+            for group_id, _, name in user_groups:
+                if name == group_name:
+                    return SMSRouter._load_group(user, group_id), content
+            for group_id, _, name in user_groups:
+                if group_name in name:
+                    return SMSRouter._load_group(user, group_id), content
             return None, content
 
         if len(user_groups) == 1:
-            return user_groups[0], content
+            return SMSRouter._load_group(user, user_groups[0][0]), content
 
         recent = SMSRouter.get_most_recent_group(user)
         return (recent, content) if recent else (None, content)
 
     @staticmethod
     def get_most_recent_group(user):
-        return (
-            Group.objects
-            .filter(memberships__user=user, memberships__is_active=True)
-            .annotate(latest_message=Max("messages__created_at"))
-            .order_by("-latest_message")
-            .first()
-        )
+        group_id = user.last_active_group_id
+        if not group_id:
+            return None
+
+        ttl = getattr(settings, "SMS_LAST_ACTIVE_GROUP_TTL", None)
+        if ttl and (not user.last_active_at or timezone.now() - user.last_active_at > timedelta(seconds=ttl)):
+            return None
+
+        # The pointer isn't cleared on leave, so check it against the current memberships.
+        if not any(str(group_id) == known_id for known_id, _, _ in RoutingCache.get(user)["groups"]):
+            return None
+        return SMSRouter._load_group(user, group_id)
 
     @staticmethod
     def get_clarification_message(user) -> str:
-        groups = Group.objects.filter(memberships__user=user, memberships__is_active=True)
-        if not groups.exists():
+        user_groups = RoutingCache.get(user)["groups"]
+        if not user_groups:
             return "You're not in any groups. Join a group at the website to start chatting."
 
-        group_list = ", ".join(g.name for g in groups)
+        group_list = ", ".join(name for _, name, _ in user_groups)
         return f"Which group? Reply with #groupname followed by your message. Your groups: {group_list}"
+
+    @staticmethod
+    def _load_group(user, group_id: str):
+        group = Group.objects.filter(id=group_id).first()
+        if group is None:
+            RoutingCache.invalidate(user.id)
+        return group
+
+
+_NUMBERS_VERSION_KEY = "sms:routes:numbers:version"
+
+
+def _routes_key(user_id) -> str:
+    return f"sms:routes:{user_id}"
+
+
+def _ttl() -> int:
+    return getattr(settings, "SMS_ROUTING_CACHE_TTL", 3600)
@@ -0,0 +1,42 @@
+import hashlib
+from itertools import chain, zip_longest
+
+from django.conf import settings
+
+__all__ = ["SenderPool", "get_sender_pool"]
+
+
+class SenderPool:
+    def __init__(self, numbers: list[str]):
+        self.numbers = list(dict.fromkeys(number for number in numbers if number))
+
+    def number_for(self, recipient: str) -> str:
+        if len(self.numbers) <= 1:
+            return self.numbers[0] if self.numbers else ""
+        # Rendezvous hashing: a recipient keeps its sender as the pool grows, and
+        # only ~1/n of recipients move to a newly added number.
+        return max(self.numbers, key=lambda number: _weight(number, recipient))
+
+    def shard(self, recipients: list[str]) -> dict[str, list[str]]:
+        shards = {}
+        for recipient in recipients:
+            shards.setdefault(self.number_for(recipient), []).append(recipient)
+        return shards
+
+    def interleave(self, recipients: list[str]) -> list[str]:
+        shards = self.shard(recipients).values()
+        return [phone for phone in chain.from_iterable(zip_longest(*shards)) if phone is not None]
+
+
+def _weight(number: str, recipient: str) -> int:
+    return int.from_bytes(hashlib.blake2b(f"{number}:{recipient}".encode(), digest_size=8).digest(), "big")
+
+
+_pools: dict[tuple[str, ...], SenderPool] = {}
+
+
+def get_sender_pool() -> SenderPool:
+    numbers = tuple(getattr(settings, "TWILIO_SENDER_NUMBERS", None) or [getattr(settings, "TWILIO_PHONE_NUMBER", "")])
+    if numbers not in _pools:
+        _pools[numbers] = SenderPool(list(numbers))
+    return _pools[numbers]
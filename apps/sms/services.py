@@ -1,48 +1,162 @@
+import logging
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+
 from django.conf import settings
-from twilio.base.exceptions import TwilioRestException
-from twilio.request_validator import RequestValidator
-from twilio.rest import Client
 
-from core.exceptions import ExternalServiceError
+from core.exceptions import ExternalServiceError, SendDeferred
+
+from .backends import BaseSMSBackend, get_backend
+from .senders import SenderPool, get_sender_pool
+from .throttle import get_send_scheduler
+
+logger = logging.getLogger(__name__)
 
 __all__ = ["SMSService"]
 
 
 class SMSService:
-    def __init__(self, account_sid: str = None, auth_token: str = None, from_number: str = None):
-        self.account_sid = account_sid or getattr(settings, "TWILIO_ACCOUNT_SID", "")
-        self.auth_token = auth_token or getattr(settings, "TWILIO_AUTH_TOKEN", "")
+    def __init__(
+        self,
+        account_sid: str = None,
+        auth_token: str = None,
+        from_number: str = None,
+        backend: BaseSMSBackend = None,
+    ):
+        self.backend = backend or get_backend(account_sid=account_sid, auth_token=auth_token)
         self.from_number = from_number or getattr(settings, "TWILIO_PHONE_NUMBER", "")
-        self._client = None
-        self._validator = None
-
-    @property
-    def client(self) -> Client:
-        if self._client is None:
-            self._client = Client(self.account_sid, self.auth_token)
-        return self._client
-
-    @property
-    def validator(self) -> RequestValidator:
-        if self._validator is None:
-            self._validator = RequestValidator(self.auth_token)
-        return self._validator
-
-    def send_sms(self, to: str, body: str) -> str:
+        self.sender_pool = SenderPool([from_number]) if from_number else get_sender_pool()
+
+    def sender_for(self, to: str) -> str:
+        return self.sender_pool.number_for(to) or self.from_number
+
+    def send_sms(self, to: str, body: str, deadline: float = None) -> str:
+        from_number = self.sender_for(to)
+        self._acquire(from_number, deadline)
+        return self.backend.send(to, body, from_number, self._status_callback())
+
+    def send_bulk(
+        self,
+        recipients: list[str],
+        body: str,
+        concurrency: int = None,
+        timeout: float = None,
+    ) -> dict[str, str]:
+        results, _ = self.send_bulk_detailed(recipients, body, concurrency, timeout)
+        return results
+
+    def send_bulk_detailed(
+        self,
+        recipients: list[str],
+        body: str,
+        concurrency: int = None,
+        timeout: float = None,
+    ) -> tuple[dict[str, str], dict[str, ExternalServiceError]]:
+        concurrency = concurrency or getattr(settings, "SMS_BULK_CONCURRENCY", 8)
+        timeout = timeout if timeout is not None else getattr(settings, "SMS_BULK_TIMEOUT", 30.0)
+        # Alternate sender numbers so one paced number can't occupy every worker.
+        recipients = self.sender_pool.interleave(list(dict.fromkeys(recipients)))
+
+        if self.backend.supports_batch:
+            return self._send_batched(recipients, body, timeout)
+        if concurrency <= 1 or len(recipients) <= 1:
+            return self._send_serial(recipients, body, timeout)
+        return self._send_concurrent(recipients, body, concurrency, timeout)
+
+    def _send_serial(self, recipients: list[str], body: str, timeout: float):
+        deadline = time.monotonic() + timeout if timeout else None
+        results, errors = {}, {}
+        for index, phone in enumerate(recipients):
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning("Bulk SMS deadline reached, %d of %d sends skipped", len(recipients) - index, len(recipients))
+                for skipped in recipients[index:]:
+                    errors[skipped] = SendDeferred("Bulk SMS deadline reached")
+                break
+            try:
+                results[phone] = self.send_sms(phone, body, deadline=deadline)
+            except ExternalServiceError as e:
+                errors[phone] = e
+        return results, errors
+
+    def _send_concurrent(self, recipients: list[str], body: str, concurrency: int, timeout: float):
+        deadline = time.monotonic() + timeout if timeout else None
+        executor = ThreadPoolExecutor(
+            max_workers=min(concurrency, len(recipients)),
+            thread_name_prefix="sms-send",
+        )
         try:
-            message = self.client.messages.create(body=body, from_=self.from_number, to=to)
-            return message.sid
-        except TwilioRestException as e:
-            raise ExternalServiceError(f"Failed to send SMS: {e}") from e
+            futures = {executor.submit(self.send_sms, phone, body, deadline): phone for phone in recipients}
+            _, not_done = wait(futures, timeout=timeout or None)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if not_done:
+            logger.warning("Bulk SMS deadline reached, %d of %d sends unfinished", len(not_done), len(recipients))
+            # Sends already handed to the provider may still go out, so retrying them
+            # could text someone twice. Wait for their outcome; only never-started
+            # sends are requeued. Each is bounded by its HTTP timeout.
+            wait([future for future in not_done if not future.cancelled()])
+
+        results, errors = {}, {}
+        for future, phone in futures.items():
+            if future.cancelled():
+                errors[phone] = SendDeferred("Bulk SMS deadline reached")
+                continue
+            try:
+                results[phone] = future.result()
+            except ExternalServiceError as e:
+                errors[phone] = e
+        return results, errors
+
+    def _send_batched(self, recipients: list[str], body: str, timeout: float):
+        # One request per chunk, made from this thread, so `concurrency` doesn't apply.
+        # A chunk holds at most a bucket's burst of sends per sender number and goes
+        # out as soon as its tokens are in hand, so the provider sees the same pace
+        # per number as individual sends would give it.
+        deadline = time.monotonic() + timeout if timeout else None
+        batch_size = getattr(settings, "SMS_BACKEND_BATCH_SIZE", 100)
+        scheduler = get_send_scheduler()
+        results, errors = {}, {}
 
-    def send_bulk(self, recipients: list[str], body: str) -> dict[str, str]:
-        results = {}
+        messages, per_sender = [], Counter()
         for phone in recipients:
+            from_number = self.sender_for(phone)
+            bucket = scheduler.get_bucket(from_number)
+            burst = int(bucket.capacity) if bucket else batch_size
+            if messages and (len(messages) >= batch_size or per_sender[from_number] >= burst):
+                self._post_batch(messages, results, errors)
+                messages, per_sender = [], Counter()
             try:
-                results[phone] = self.send_sms(phone, body)
-            except ExternalServiceError:
+                self._acquire(from_number, deadline)
+            except ExternalServiceError as e:
+                errors[phone] = e
                 continue
-        return results
+            messages.append((phone, body, from_number))
+            per_sender[from_number] += 1
+        if messages:
+            self._post_batch(messages, results, errors)
+        return results, errors
+
+    def _post_batch(self, messages: list[tuple[str, str, str]], results: dict, errors: dict) -> None:
+        try:
+            outcomes = self.backend.send_batch(messages, self._status_callback())
+        except ExternalServiceError as e:
+            outcomes = [e] * len(messages)
+        for (phone, _, _), outcome in zip(messages, outcomes):
+            if isinstance(outcome, ExternalServiceError):
+                errors[phone] = outcome
+            else:
+                results[phone] = outcome
+
+    @staticmethod
+    def _acquire(from_number: str, deadline: float = None) -> None:
+        timeout = max(deadline - time.monotonic(), 0.0) if deadline is not None else None
+        get_send_scheduler().acquire(from_number, timeout=timeout)
+
+    @staticmethod
+    def _status_callback() -> str:
+        return getattr(settings, "TWILIO_STATUS_CALLBACK_URL", "")
 
     def validate_webhook_signature(self, url: str, params: dict, signature: str) -> bool:
-        return self.validator.validate(url, params, signature)
+        return self.backend.validate_signature(url, params, signature)
@@ -0,0 +1,97 @@
+import threading
+import time
+
+from django.conf import settings
+
+from core.exceptions import SendDeferred
+
+__all__ = ["TokenBucket", "SendScheduler", "get_send_scheduler"]
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.acquired = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def acquire(self, timeout: float = None) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Tokens may go negative: each caller reserves the next free slot, so
+            # waiters are released in arrival order at exactly `rate` per second.
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if timeout is not None and wait > timeout:
+                # Nothing is reserved; the caller requeues the send for when its slot comes up.
+                raise SendDeferred("Send rate limit wait exceeds deadline", retry_after=wait)
+
+            self._tokens -= 1
+            self.acquired += 1
+            if wait:
+                self.waiting += 1
+                self.delayed += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+
+        if wait:
+            time.sleep(wait)
+            with self._lock:
+                self.waiting -= 1
+        return wait
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "queue_depth": self.waiting,
+                "acquired": self.acquired,
+                "delayed": self.delayed,
+                "avg_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+                "max_wait": self.max_wait,
+            }
+
+
+class SendScheduler:
+    # Per-process: pacing holds per number only if this is the only sending process,
+    # otherwise SMS_SENDER_MPS / SMS_NUMBER_MPS must be split between them.
+    def __init__(self):
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, number: str) -> TokenBucket | None:
+        bucket = self._buckets.get(number)
+        if bucket is not None:
+            return bucket
+
+        overrides = getattr(settings, "SMS_NUMBER_MPS", {})
+        rate = float(overrides.get(number, getattr(settings, "SMS_SENDER_MPS", 0)))
+        if rate <= 0:
+            return None
+
+        with self._lock:
+            if number not in self._buckets:
+                self._buckets[number] = TokenBucket(rate, getattr(settings, "SMS_SENDER_BURST", 1))
+            return self._buckets[number]
+
+    def acquire(self, number: str, timeout: float = None) -> float:
+        bucket = self.get_bucket(number)
+        return bucket.acquire(timeout) if bucket else 0.0
+
+    def stats(self) -> dict[str, dict]:
+        return {number: bucket.stats() for number, bucket in list(self._buckets.items())}
+
+
+_scheduler = SendScheduler()
+
+
+def get_send_scheduler() -> SendScheduler:
+    return _scheduler
@@ -1,13 +1,12 @@
 from xml.sax.saxutils import escape
 
+from django.conf import settings
 from django.http import HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
-from apps.messages.services import MessageService
-from apps.users.services import UserService
-
-from .routing import SMSRouter
+from .delivery import get_status_buffer
+from .inbound import InboundService
 from .services import SMSService
 
 
@@ -19,44 +18,48 @@ def make_twiml_response(message: str = "") -> HttpResponse:
     )
 
 
-@csrf_exempt
-@require_POST
-def twilio_webhook(request) -> HttpResponse:
+def is_valid_twilio_request(request) -> bool:
     signature = request.META.get("HTTP_X_TWILIO_SIGNATURE", "")
     if not signature:
-        return make_twiml_response()
+        return False
 
-    if not SMSService().validate_webhook_signature(
+    return SMSService().validate_webhook_signature(
         request.build_absolute_uri(),
         request.POST.dict(),
         signature
-    ):
-        return make_twiml_response()
-
-    from_number = request.POST.get("From", "")
-    body = request.POST.get("Body", "")
+    )
 
-    response = _process_inbound_sms(from_number, body)
-    return make_twiml_response(response)
 
+@csrf_exempt
+@require_POST
+def twilio_webhook(request) -> HttpResponse:
+    if not is_valid_twilio_request(request):
+        return make_twiml_response()
 
-def _process_inbound_sms(from_number: str, body: str) -> str:
-    user = UserService.get_user_by_phone(from_number)
-    if not user:
-        return "This phone number is not registered. Sign up at the website to join."
+    params = request.POST.dict()
+    if InboundService.seen(params.get("MessageSid", "")):
+        return make_twiml_response()
 
-    group, content = SMSRouter.get_target_group(user, body)
+    if getattr(settings, "SMS_INBOUND_MODE", "sync") == "async":
+        try:
+            InboundService.store(params)
+        except Exception:
+            InboundService.forget(params.get("MessageSid", ""))
+            raise
+        return make_twiml_response()
 
-    if not group:
-        if not user.memberships.filter(is_active=True).exists():
-            return "You're not in any groups. Join a group at the website to start chatting."
-        return SMSRouter.get_clarification_message(user)
+    response = InboundService.receive(params)
+    return make_twiml_response(response or "")
 
-    if not content or not content.strip():
-        return "Message cannot be empty."
 
-    try:
-        MessageService.send_message(sender=user, group=group, content=content)
-        return ""
-    except Exception:
-        return "Sorry, there was an error sending your message. Please try again."
+@csrf_exempt
+@require_POST
+def twilio_status_callback(request) -> HttpResponse:
+    if not is_valid_twilio_request(request):
+        return HttpResponse(status=403)
+
+    sid = request.POST.get("MessageSid", "")
+    status = request.POST.get("MessageStatus", "")
+    if sid and status:
+        get_status_buffer().add(sid, status, request.POST.get("ErrorCode", ""))
+    return HttpResponse(status=204)
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_last_active_group(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    Membership = apps.get_model("groups", "Membership")
+    Message = apps.get_model("chat_messages", "Message")
+
+    latest = dict(
+        Message.objects.values("group").annotate(latest=models.Max("created_at")).values_list("group", "latest")
+    )
+    pointers = {}
+    for user_id, group_id in Membership.objects.filter(is_active=True).values_list("user", "group"):
+        if group_id in latest and (user_id not in pointers or latest[group_id] > pointers[user_id][1]):
+            pointers[user_id] = (group_id, latest[group_id])
+
+    users = list(User.objects.filter(id__in=list(pointers)))
+    for user in users:
+        user.last_active_group_id, user.last_active_at = pointers[user.id]
+    User.objects.bulk_update(users, ["last_active_group", "last_active_at"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('groups', '0003_group_digest_enabled'),
+        ('chat_messages', '0001_initial'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='last_active_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='last_active_group',
+            field=models.ForeignKey(blank=True, help_text='Group the user last sent or received a message in; routes unprefixed SMS', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='groups.group'),
+        ),
+        migrations.RunPython(backfill_last_active_group, migrations.RunPython.noop),
+    ]
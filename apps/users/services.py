@@ -1,16 +1,35 @@
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
 import jwt
 import phonenumbers
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import IntegrityError
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 
 from core.exceptions import AuthError, ConflictError, NotFound, ValidationError
 
 User = get_user_model()
 
-__all__ = ["UserService"]
+__all__ = ["PhoneLookupCache", "UserService"]
+
+
+class PhoneLookupCache:
+    # Numbers with no account. Texts from strangers repeat, and remembering them
+    # skips the database; registered users are always read from it (one indexed
+    # lookup), so deactivation needs no invalidation. create_user clears the entry.
+    @staticmethod
+    def is_unknown(phone_number: str) -> bool:
+        return cache.get(_phone_key(phone_number)) is not None
+
+    @staticmethod
+    def mark_unknown(phone_number: str) -> None:
+        cache.set(_phone_key(phone_number), 1, getattr(settings, "PHONE_LOOKUP_CACHE_TTL", 3600))
+
+    @staticmethod
+    def invalidate(phone_number: str) -> None:
+        cache.delete(_phone_key(phone_number))
 
 
 class UserService:
@@ -23,25 +42,24 @@ class UserService:
             raise ValidationError("Phone number is required")
 
         region = getattr(settings, "PHONE_NUMBER_DEFAULT_REGION", "US")
-        try:
-            parsed = phonenumbers.parse(phone_number, region)
-            if not phonenumbers.is_valid_number(parsed):
-                raise ValidationError("Invalid phone number")
-            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
-        except phonenumbers.NumberParseException:
-            raise ValidationError("Invalid phone number format")
+        normalized, error = _normalize_phone_number(phone_number, region)
+        if error:
+            raise ValidationError(error)
+        return normalized
 
     @staticmethod
     def create_user(phone_number: str, name: str, password: str) -> User:
         normalized_phone = UserService.validate_phone_number(phone_number)
         try:
-            return User.objects.create_user(
+            user = User.objects.create_user(
                 phone_number=normalized_phone,
                 name=name.strip(),
                 password=password,
             )
         except IntegrityError:
             raise ConflictError("Phone number already registered")
+        transaction.on_commit(lambda: PhoneLookupCache.invalidate(normalized_phone))
+        return user
 
     @staticmethod
     def authenticate(phone_number: str, password: str) -> User:
@@ -71,9 +89,16 @@ class UserService:
     def get_user_by_phone(phone_number: str) -> User | None:
         try:
             normalized = UserService.validate_phone_number(phone_number)
-            return User.objects.get(phone_number=normalized)
-        except (ValidationError, User.DoesNotExist):
+        except ValidationError:
+            return None
+
+        if PhoneLookupCache.is_unknown(normalized):
+            return None
+        user = User.objects.filter(phone_number=normalized).first()
+        if user is None:
+            PhoneLookupCache.mark_unknown(normalized)
             return None
+        return user if user.is_active else None
 
     @staticmethod
     def generate_jwt_token(user: User) -> str:
@@ -103,3 +128,20 @@ class UserService:
             return User.objects.get(id=payload["sub"], is_active=True)
         except (jwt.InvalidTokenError, User.DoesNotExist):
             return None
+
+
+@lru_cache(maxsize=4096)
+def _normalize_phone_number(phone_number: str, region: str) -> tuple[str | None, str | None]:
+    # Inbound webhooks repeat the same few thousand From numbers all day, and the
+    # parse is the hot spot; invalid inputs are memoized too, as their error.
+    try:
+        parsed = phonenumbers.parse(phone_number, region)
+    except phonenumbers.NumberParseException:
+        return None, "Invalid phone number format"
+    if not phonenumbers.is_valid_number(parsed):
+        return None, "Invalid phone number"
+    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164), None
+
+
+def _phone_key(phone_number: str) -> str:
+    return f"users:phone:{phone_number}"
@@ -1,10 +1,10 @@
 from django.conf import settings
 from django.contrib import messages
-from django.db.models import Count, Q
 from django.shortcuts import redirect, render
 
 from apps.groups.models import Group, Membership
 from apps.groups.services import GroupService, MembershipService
+from apps.messages.search import MessageSearchService
 from apps.messages.services import MessageService
 from apps.users.services import UserService
 from apps.users.verification import get_verification_service
@@ -107,22 +107,12 @@ def dashboard_view(request):
 
     my_group_ids = Membership.objects.filter(user=user, is_active=True).values_list("group_id", flat=True)
 
-    my_groups = (
-        Group.objects
-        .filter(id__in=my_group_ids)
-        .annotate(_member_count=Count("memberships", filter=Q(memberships__is_active=True)))
-        .order_by("-created_at")
-    )
+    my_groups = Group.objects.filter(id__in=my_group_ids).order_by("-created_at")
 
-    available_qs = Group.objects.exclude(id__in=my_group_ids)
     if search_query:
-        available_qs = available_qs.filter(name__icontains=search_query)
-
-    available_groups = (
-        available_qs
-        .annotate(_member_count=Count("memberships", filter=Q(memberships__is_active=True)))
-        .order_by("-created_at")[:20]
-    )
+        available_groups = GroupService.search_groups(search_query, 20, exclude_ids=my_group_ids)
+    else:
+        available_groups = Group.objects.exclude(id__in=my_group_ids).order_by("-created_at")[:20]
 
     return render(request, "web/dashboard.html", {
         "user": user,
@@ -178,7 +168,20 @@ def group_detail_view(request, group_id):
         messages.error(request, "You must be a member to view this group.")
         return redirect("web:dashboard")
 
-    messages_list = list(reversed(MessageService.get_group_messages(group, limit=50)))
+    search_query = request.GET.get("q", "").strip()
+    before = request.GET.get("before") or None
+    search_hits, more_cursor = [], None
+    try:
+        if search_query:
+            search_hits, more_cursor = MessageSearchService.search(
+                user, search_query, group=group, after=request.GET.get("after") or None,
+            )
+            page, older_cursor = [], None
+        else:
+            page, older_cursor = MessageService.get_message_page(group, first=50, before=before)
+    except ValidationError:
+        return redirect("web:group_detail", group_id=group_id)
+    messages_list = list(reversed(page))
     members = list(group.get_active_members())
     my_groups_count = Membership.objects.filter(user=user, is_active=True).count()
 
@@ -186,6 +189,11 @@ def group_detail_view(request, group_id):
         "user": user,
         "group": group,
         "messages_list": messages_list,
+        "older_cursor": older_cursor,
+        "showing_older": bool(before),
+        "search_query": search_query,
+        "search_hits": search_hits,
+        "more_cursor": more_cursor,
         "members": members,
         "my_groups_count": my_groups_count,
         "twilio_number": getattr(settings, "TWILIO_PHONE_NUMBER", "N/A"),
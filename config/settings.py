@@ -80,6 +80,14 @@ DATABASES = {
     "default": env.db("DATABASE_URL", default="postgres://localhost:5432/sms_chat")
 }
 
+# Cache. Must be shared (e.g. redis://) by every web process and sms_worker:
+# inbound deduplication, rate limits, and the routing/phone lookup caches and
+# their invalidations only hold across processes that see the same cache. The
+# local-memory default is for single-process development.
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://sms-chat?MAX_ENTRIES=50000")
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -124,6 +132,13 @@ JWT_EXPIRATION_HOURS = env.int("JWT_EXPIRATION_HOURS", default=24)
 TWILIO_ACCOUNT_SID = env("TWILIO_ACCOUNT_SID", default="")
 TWILIO_AUTH_TOKEN = env("TWILIO_AUTH_TOKEN", default="")
 TWILIO_PHONE_NUMBER = env("TWILIO_PHONE_NUMBER", default="")
+# Outbound sender pool; recipients are sharded across these numbers.
+TWILIO_SENDER_NUMBERS = env.list("TWILIO_SENDER_NUMBERS", default=[TWILIO_PHONE_NUMBER] if TWILIO_PHONE_NUMBER else [])
+# Public URL of the status webhook, e.g. https://example.com/webhooks/twilio/status/
+TWILIO_STATUS_CALLBACK_URL = env("TWILIO_STATUS_CALLBACK_URL", default="")
+# Shared keep-alive pool per credential set; keep it >= SMS_BULK_CONCURRENCY.
+TWILIO_HTTP_POOL_SIZE = env.int("TWILIO_HTTP_POOL_SIZE", default=32)
+TWILIO_HTTP_TIMEOUT = env.float("TWILIO_HTTP_TIMEOUT", default=10.0)
 
 # Validate Twilio config on startup (warn in debug, fail in production)
 if not (TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN and TWILIO_PHONE_NUMBER):
@@ -134,11 +149,78 @@ if not (TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN and TWILIO_PHONE_NUMBER):
         from django.core.exceptions import ImproperlyConfigured
         raise ImproperlyConfigured("Twilio configuration incomplete")
 
+# SMS delivery settings
+# Provider backend: apps.sms.backends.twilio.TwilioBackend (default),
+# apps.sms.backends.memory.InMemoryBackend, or apps.sms.backends.http.HTTPStandInBackend
+# against `manage.py sms_standin` for offline load tests.
+SMS_BACKEND = env("SMS_BACKEND", default="apps.sms.backends.twilio.TwilioBackend")
+# Most messages per request to batch-capable backends; chunks also stop at each
+# sender's SMS_SENDER_BURST so per-number pacing holds.
+SMS_BACKEND_BATCH_SIZE = env.int("SMS_BACKEND_BATCH_SIZE", default=100)
+SMS_STANDIN_URL = env("SMS_STANDIN_URL", default="http://127.0.0.1:8025")
+# "outbox" queues broadcasts for the sms_worker command; "sync" sends inline.
+SMS_DELIVERY_MODE = env("SMS_DELIVERY_MODE", default="outbox")
+SMS_OUTBOX_BATCH_SIZE = env.int("SMS_OUTBOX_BATCH_SIZE", default=100)
+SMS_OUTBOX_POLL_INTERVAL = env.float("SMS_OUTBOX_POLL_INTERVAL", default=1.0)
+SMS_OUTBOX_LEASE_SECONDS = env.int("SMS_OUTBOX_LEASE_SECONDS", default=300)
+# "async" stores inbound webhooks and acks immediately; sms_worker processes them.
+SMS_INBOUND_MODE = env("SMS_INBOUND_MODE", default="sync")
+SMS_INBOUND_BATCH_SIZE = env.int("SMS_INBOUND_BATCH_SIZE", default=50)
+# Seconds the worker waits for a partial inbound batch to fill before posting it.
+SMS_INBOUND_BATCH_LINGER = env.float("SMS_INBOUND_BATCH_LINGER", default=0.005)
+# Numbers owners may assign to a group (keep them out of TWILIO_SENDER_NUMBERS);
+# texts to a group's number skip prefix routing.
+SMS_GROUP_NUMBERS = env.list("SMS_GROUP_NUMBERS", default=[])
+# Twilio retries slow webhooks; MessageSids seen within this window are dropped.
+SMS_INBOUND_DEDUP_TTL = env.int("SMS_INBOUND_DEDUP_TTL", default=3600)
+# Inbound flood protection: messages per sliding window per sender phone and per
+# group (0 disables). Counters live in the shared cache.
+SMS_INBOUND_SENDER_LIMIT = env.int("SMS_INBOUND_SENDER_LIMIT", default=20)
+SMS_INBOUND_SENDER_WINDOW = env.float("SMS_INBOUND_SENDER_WINDOW", default=60.0)
+SMS_INBOUND_GROUP_LIMIT = env.int("SMS_INBOUND_GROUP_LIMIT", default=120)
+SMS_INBOUND_GROUP_WINDOW = env.float("SMS_INBOUND_GROUP_WINDOW", default=60.0)
+# Per-user group routing snapshots; membership changes invalidate them immediately.
+SMS_ROUTING_CACHE_TTL = env.int("SMS_ROUTING_CACHE_TTL", default=3600)
+# Unprefixed texts go to the user's last active group; after this many seconds idle, ask instead.
+SMS_LAST_ACTIVE_GROUP_TTL = env.int("SMS_LAST_ACTIVE_GROUP_TTL", default=None)
+SMS_RETRY_MAX_ATTEMPTS = env.int("SMS_RETRY_MAX_ATTEMPTS", default=5)
+SMS_RETRY_BASE_DELAY = env.float("SMS_RETRY_BASE_DELAY", default=2.0)
+SMS_RETRY_MAX_DELAY = env.float("SMS_RETRY_MAX_DELAY", default=300.0)
+# Outbound bodies: optional GSM-7 look-alike substitution (avoids UCS-2 for smart
+# quotes and dashes) and splitting into numbered parts.
+SMS_GSM7_SUBSTITUTION = env.bool("SMS_GSM7_SUBSTITUTION", default=False)
+SMS_MAX_BODY_LENGTH = env.int("SMS_MAX_BODY_LENGTH", default=1600)
+SMS_MAX_SEGMENTS_PER_PART = env.int("SMS_MAX_SEGMENTS_PER_PART", default=10)
+# Digest mode: groups with digest_enabled coalesce each member's SMS within the
+# window (keep it below SMS_OUTBOX_LEASE_SECONDS), up to a segment budget.
+SMS_DIGEST_WINDOW_SECONDS = env.float("SMS_DIGEST_WINDOW_SECONDS", default=60.0)
+SMS_DIGEST_MAX_SEGMENTS = env.int("SMS_DIGEST_MAX_SEGMENTS", default=3)
+# Delivery status callbacks are buffered and written in bulk
+SMS_STATUS_BUFFER_SIZE = env.int("SMS_STATUS_BUFFER_SIZE", default=500)
+SMS_STATUS_BUFFER_SECONDS = env.float("SMS_STATUS_BUFFER_SECONDS", default=2.0)
+SMS_BULK_CONCURRENCY = env.int("SMS_BULK_CONCURRENCY", default=8)
+SMS_BULK_TIMEOUT = env.float("SMS_BULK_TIMEOUT", default=30.0)
+# Messages-per-second budget per sender number (0 disables pacing), e.g.
+# SMS_NUMBER_MPS=+15559876543=1,+18005550100=3 for per-number limits.
+# Buckets live in each process, so every process that sends (each sms_worker,
+# and each web process in sync mode) spends the full budget. With N sending
+# processes, set these to the carrier limit divided by N.
+SMS_SENDER_MPS = env.float("SMS_SENDER_MPS", default=0.0)
+SMS_SENDER_BURST = env.int("SMS_SENDER_BURST", default=1)
+SMS_NUMBER_MPS = env.dict("SMS_NUMBER_MPS", cast={"value": float}, default={})
+
 # Phone number settings
 PHONE_NUMBER_DEFAULT_REGION = env("PHONE_NUMBER_DEFAULT_REGION", default="US")
+# How long a number with no account is remembered; signing up with it clears the entry.
+PHONE_LOOKUP_CACHE_TTL = env.int("PHONE_LOOKUP_CACHE_TTL", default=3600)
 
 # Group settings
 MAX_GROUPS_PER_USER = env.int("MAX_GROUPS_PER_USER", default=10)
+# Messages from older months move to compressed archives via archive_messages.
+MESSAGE_HOT_MONTHS = env.int("MESSAGE_HOT_MONTHS", default=6)
+# Group search: pg_trgm on Postgres, an in-process trigram index elsewhere.
+# Names that don't contain the query need at least this similarity to match.
+GROUP_SEARCH_MIN_SIMILARITY = env.float("GROUP_SEARCH_MIN_SIMILARITY", default=0.3)
 
 # Logging
 LOGGING = {
@@ -6,12 +6,13 @@ from django.urls import include, path
 from django.views.decorators.csrf import csrf_exempt
 from graphene_django.views import GraphQLView
 
-from apps.sms.views import twilio_webhook
+from apps.sms.views import twilio_status_callback, twilio_webhook
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("graphql/", csrf_exempt(GraphQLView.as_view(graphiql=True))),
     path("webhooks/twilio/inbound/", twilio_webhook, name="twilio_webhook"),
+    path("webhooks/twilio/status/", twilio_status_callback, name="twilio_status_callback"),
     # Web UI
     path("", include("apps.web.urls")),
 ]
@@ -24,3 +24,16 @@ class ConflictError(DomainError):
 
 class ExternalServiceError(DomainError):
     code = "EXTERNAL_ERROR"
+
+
+class TransientServiceError(ExternalServiceError):
+    code = "EXTERNAL_UNAVAILABLE"
+
+
+class SendDeferred(TransientServiceError):
+    # Held back by local send pacing before reaching the provider; not a failed attempt.
+    code = "SEND_DEFERRED"
+
+    def __init__(self, message: str = None, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
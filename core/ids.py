@@ -0,0 +1,34 @@
+import os
+import threading
+import time
+import uuid
+
+__all__ = ["uuid7"]
+
+_lock = threading.Lock()
+_last_ms = 0
+_sequence = 0
+
+
+def uuid7() -> uuid.UUID:
+    # RFC 9562 UUIDv7: 48-bit Unix milliseconds, then a 12-bit sequence and 62
+    # random bits. New rows land at the right-hand edge of the primary-key index
+    # instead of at random pages. The sequence keeps ids from one process strictly
+    # increasing within a millisecond; when it overflows, borrow the next one.
+    global _last_ms, _sequence
+    with _lock:
+        now = time.time_ns() // 1_000_000
+        if now > _last_ms:
+            _last_ms = now
+            # Start low in the range so a busy millisecond has room to count up.
+            _sequence = int.from_bytes(os.urandom(2), "big") & 0x3FF
+        else:
+            _sequence += 1
+            if _sequence > 0xFFF:
+                _last_ms += 1
+                _sequence = 0
+        ms, sequence = _last_ms, _sequence
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (ms & ((1 << 48) - 1)) << 80 | 0x7 << 76 | sequence << 64 | 0b10 << 62 | rand_b
+    return uuid.UUID(int=value)
@@ -3,11 +3,12 @@ import graphene
 from apps.groups.mutations import GroupMutation
 from apps.groups.schema import GroupQuery
 from apps.messages.mutations import MessageMutation
+from apps.messages.schema import MessageQuery
 from apps.users.mutations import UserMutation
 from apps.users.schema import UserQuery
 
 
-class Query(UserQuery, GroupQuery, graphene.ObjectType):
+class Query(UserQuery, GroupQuery, MessageQuery, graphene.ObjectType):
     pass
 
 